@@ -3,6 +3,7 @@ import sys
 import os
 import time
 import re  # Impor Regex untuk memecah kalimat
+import contextlib
 
 # Ambil path ke direktori 'app/'
 current_dir = os.path.dirname(__file__)
@@ -17,6 +18,8 @@ from src import search
 from src import preprocess
 from src import vsm_ir
 from src import boolean_ir
+from src import term_index
+from src import instrumentation
 
 # --- 1. Konfigurasi Halaman & Styling Kustom ---
 
@@ -82,23 +85,18 @@ st.markdown(custom_css, unsafe_allow_html=True)
 
 @st.cache_resource
 def load_data():
-    """Load semua data/index saat aplikasi dimulai dan cache."""
-    print("Memuat data untuk UI Streamlit...")
-    processed_docs = preprocess.load_documents('data/processed')
-    docs_tokens = {doc_id: preprocess.tokenize(text) for doc_id, text in processed_docs.items()}
-    
-    N = len(docs_tokens)
-    tf = vsm_ir.calculate_tf(docs_tokens)
-    df = vsm_ir.calculate_df(docs_tokens)
-    idf = vsm_ir.calculate_idf(df, N)
-    
-    # UI ini hanya akan menggunakan satu skema, misal 'sublinear_tf'
-    tfidf_matrix = vsm_ir.build_tfidf_matrix(tf, idf, scheme='sublinear_tf')
-    print("Data UI Streamlit (sublinear_tf) siap.")
-    
-    return docs_tokens, idf, tfidf_matrix
+    """
+    Indeks dikelola oleh search.MANAGER (dimuat sekali per proses server).
+    Watcher background memantau data/processed dan menukar snapshot secara
+    atomik, sehingga cache ini tidak perlu di-refresh saat korpus berubah.
+    """
+    watch_interval = float(os.environ.get('EDUKES_INDEX_WATCH_INTERVAL', '10'))
+    if watch_interval > 0:
+        search.MANAGER.start_watching(watch_interval)
+    print(f"Indeks UI Streamlit siap (versi {search.MANAGER.current().version[:12]}).")
+    return search.MANAGER
 
-UI_DOCS_TOKENS, UI_IDF, UI_TFIDF_MATRIX = load_data()
+INDEX_MANAGER = load_data()
 
 # --- 3. Fungsi Utility (Termasuk Rangkuman Baru) ---
 
@@ -178,19 +176,31 @@ def get_snippet(doc_id, max_char=180):
     return raw_text.strip()[:max_char] + '...' if len(raw_text.strip()) > max_char else raw_text.strip()
 
 
-def ui_search_vsm(query_str, k):
+@search.with_snapshot # Query selesai di snapshot ini walau indeks di-reload
+def ui_search_vsm(query_str, k, snapshot=None):
     """Fungsi VSM khusus untuk UI (memisahkan dari search.py)."""
-    query_processed_tokens = preprocess.preprocess_document(query_str)
-    query_vector = vsm_ir.vectorize_query(query_processed_tokens, UI_IDF, scheme='sublinear_tf')
-    rankings = vsm_ir.rank_documents(UI_TFIDF_MATRIX, query_vector, k)
-    
-    # Tambahkan explainability
-    explained_rankings = []
-    query_terms_set = set(query_processed_tokens)
-    for doc_id, score in rankings:
-        doc_tokens_set = set(UI_DOCS_TOKENS.get(doc_id, [])) # Gunakan .get() agar aman
-        matching_terms = list(query_terms_set.intersection(doc_tokens_set))
-        explained_rankings.append((doc_id, score, matching_terms[:5]))
+    if snapshot.shared_index is not None:
+        with instrumentation.timer('ui_search_vsm'):
+            return snapshot.shared_index.search_vsm(query_str, k, 'sublinear_tf')
+
+    # Ekspansi wildcard & koreksi typo (misal "kolestrol" -> "kolesterol")
+    with instrumentation.timer('ui_search_vsm'):
+        with instrumentation.timer('preprocess'):
+            query_processed_tokens = term_index.expand_query_tokens(query_str, snapshot.term_dict)
+        with instrumentation.timer('vectorize_query'):
+            query_vector = vsm_ir.vectorize_query(query_processed_tokens, snapshot.idf, scheme='sublinear_tf')
+        with instrumentation.timer('rank_documents'):
+            # UI ini hanya menggunakan satu skema: 'sublinear_tf'
+            rankings = vsm_ir.rank_documents(snapshot.tfidf_matrices['sublinear_tf'], query_vector, k)
+        
+        # Tambahkan explainability
+        with instrumentation.timer('explain'):
+            explained_rankings = []
+            query_terms_set = set(query_processed_tokens)
+            for doc_id, score in rankings:
+                doc_tokens_set = set(snapshot.docs_tokens.get(doc_id, [])) # Gunakan .get() agar aman
+                matching_terms = list(query_terms_set.intersection(doc_tokens_set))
+                explained_rankings.append((doc_id, score, matching_terms[:5]))
         
     return explained_rankings
 
@@ -198,6 +208,11 @@ def ui_search_vsm(query_str, k):
 
 if 'rankings' not in st.session_state:
     st.session_state.rankings = None
+if 'profiler' not in st.session_state:
+    st.session_state.profiler = None
+
+# Panel debug: profiling per request (tidak aktif secara default)
+debug_mode = st.sidebar.checkbox("🛠️ Mode Debug (Profiling)", value=False)
 
 st.markdown("<div class='header'>🧠 EduKesehatan Search Engine</div>", unsafe_allow_html=True)
 
@@ -218,7 +233,9 @@ with st.container():
         if st.session_state.current_query:
             with st.spinner('Menganalisis dan meranking dokumen...'):
                 time.sleep(1) # Simulasi jeda
-                st.session_state.rankings = ui_search_vsm(st.session_state.current_query, k_val)
+                st.session_state.profiler = instrumentation.Profiler() if debug_mode else None
+                with instrumentation.profile(st.session_state.profiler) if debug_mode else contextlib.nullcontext():
+                    st.session_state.rankings = ui_search_vsm(st.session_state.current_query, k_val)
         else:
             st.error("Mohon masukkan query pencarian terlebih dahulu.")
             st.session_state.rankings = None
@@ -231,7 +248,10 @@ if st.session_state.rankings is not None:
         # --- Rangkuman Cepat (LOGIKA BARU) ---
         with st.spinner("Membuat rangkuman cepat..."):
             # Panggil fungsi rangkuman ekstraktif yang baru
-            summary_text = generate_extractive_summary(rankings, st.session_state.current_query, max_sentences=2)
+            profiler = st.session_state.profiler if (debug_mode and search_pressed) else None
+            with instrumentation.profile(profiler) if profiler else contextlib.nullcontext():
+                with instrumentation.timer('summary'):
+                    summary_text = generate_extractive_summary(rankings, st.session_state.current_query, max_sentences=2)
         st.info(f"**Rangkuman Cepat:** {summary_text}")
         
         st.subheader(f"📚 Hasil Pencarian Detil (Top {len(rankings)})")
@@ -246,5 +266,21 @@ if st.session_state.rankings is not None:
                 if explain_terms:
                     explain_str = ", ".join(explain_terms)
                     st.caption(f"Istilah Cocok: {explain_str}")
+                duplicates = search.duplicates_of(doc_id)
+                if duplicates:
+                    st.caption(f"Salinan serupa: {', '.join(duplicates)}")
     else:
-        st.warning("Tidak ditemukan dokumen yang relevan. Coba ganti kata kunci Anda.")
\ No newline at end of file
+        st.warning("Tidak ditemukan dokumen yang relevan. Coba ganti kata kunci Anda.")
+
+    # --- Panel Debug (Profiling) ---
+    if debug_mode and st.session_state.profiler is not None:
+        with st.expander("🛠️ Debug: Profil Eksekusi"):
+            profile_data = st.session_state.profiler.to_dict()
+            st.dataframe([
+                {"Tahap": stage, "Panggilan": stats["count"], "Total (ms)": stats["total_ms"]}
+                for stage, stats in profile_data["timers"].items()
+            ])
+            st.json(profile_data["counters"])
+            st.code(st.session_state.profiler.to_prometheus(), language="text")
+            st.caption("Status indeks (hot reload)")
+            st.json(INDEX_MANAGER.status())
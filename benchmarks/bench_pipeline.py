@@ -0,0 +1,242 @@
+import os
+import sys
+import gc
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+
+# Menambahkan path agar bisa impor modul dari root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src import preprocess, boolean_ir, vsm_ir, collection_stats
+from benchmarks import synthetic_corpus
+
+"""
+Benchmark setiap tahap pipeline EduKesehatan di atas korpus sintetis.
+Tahap yang diukur:
+1. preprocess.preprocess_document   (per dokumen, pada sampel)
+2. boolean_ir.build_inverted_index  (seluruh korpus)
+3. vsm_ir.calculate_tf / calculate_df / calculate_idf,
+   collection_stats.collect_index_statistics (postings+TF+DF+CF+top-N, satu lintasan indexing)
+   dan collection_stats.collect_statistics (TF+DF+CF+top-N untuk laporan)
+4. vsm_ir.build_tfidf_matrix
+5. boolean_ir.parse_and_execute_boolean_query (per query)
+6. vsm_ir.rank_documents & rank_documents_batch (per query)
+Output: throughput, latensi p50/p95/p99, peak memory (tracemalloc),
+disimpan sebagai baseline JSON yang dapat dibandingkan (--compare).
+"""
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+DEFAULT_BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+
+# --- Utilitas Pengukuran ---
+
+def percentile(sorted_values, pct):
+    """Persentil dengan interpolasi linear (sorted_values sudah terurut)."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def summarize(latencies_s, items_per_call, unit):
+    """Ringkasan latensi (ms) dan throughput (item/detik)."""
+    latencies_ms = sorted(t * 1000 for t in latencies_s)
+    total_s = sum(latencies_s)
+    return {
+        "unit": unit,
+        "calls": len(latencies_s),
+        "total_s": round(total_s, 6),
+        "throughput_per_s": round(items_per_call * len(latencies_s) / total_s, 3) if total_s > 0 else None,
+        "mean_ms": round(total_s * 1000 / len(latencies_s), 6) if latencies_s else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 6),
+        "p95_ms": round(percentile(latencies_ms, 95), 6),
+        "p99_ms": round(percentile(latencies_ms, 99), 6),
+    }
+
+def time_calls(fn, args_list):
+    """Menjalankan fn(*args) untuk setiap args, mengembalikan (hasil_terakhir, latensi)."""
+    latencies = []
+    result = None
+    for args in args_list:
+        start = time.perf_counter()
+        result = fn(*args)
+        latencies.append(time.perf_counter() - start)
+    return result, latencies
+
+def peak_memory_mb(fn, args_list):
+    """Peak memory (MB) yang dialokasikan selama pemanggilan, via tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for args in args_list:
+            fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 3)
+
+def run_stage(name, fn, args_list, items_per_call, unit, measure_memory, results):
+    """Mengukur satu tahap dan menyimpan ringkasannya di results[name]."""
+    output, latencies = time_calls(fn, args_list)
+    stats = summarize(latencies, items_per_call, unit)
+    if measure_memory:
+        # Diukur terpisah: tracemalloc memperlambat eksekusi secara signifikan
+        stats["peak_mem_mb"] = peak_memory_mb(fn, args_list[:1])
+    results[name] = stats
+    print(f"  {name.ljust(34)} p50={stats['p50_ms']:.3f}ms  p99={stats['p99_ms']:.3f}ms  "
+          f"throughput={stats['throughput_per_s']} {unit}/s"
+          + (f"  peak={stats['peak_mem_mb']}MB" if measure_memory else ""))
+    return output
+
+# --- Benchmark ---
+
+def make_queries(docs_tokens, n_queries, seed):
+    """Query Boolean & VSM diambil dari token dokumen agar postings tidak kosong."""
+    rng = random.Random(seed)
+    doc_ids = list(docs_tokens.keys())
+    boolean_queries, vsm_queries = [], []
+    operators = ['and', 'or', 'not']
+    for i in range(n_queries):
+        tokens = docs_tokens[rng.choice(doc_ids)]
+        terms = rng.sample(tokens, min(3, len(tokens)))
+        boolean_queries.append(f" {operators[i % 3]} ".join(terms[:2]))
+        vsm_queries.append(terms)
+    return boolean_queries, vsm_queries
+
+def reset_stemmer_cache():
+    """Mengosongkan cache Sastrawi agar stemming selalu diukur dalam kondisi dingin."""
+    get_cache = getattr(preprocess.STEMMER, 'get_cache', None)
+    cache = get_cache() if get_cache else None
+    if cache is not None and hasattr(cache, 'data'):
+        cache.data.clear()
+
+def benchmark_size(n_docs, args, root_words):
+    """Menjalankan seluruh tahap untuk satu ukuran korpus."""
+    print(f"\n--- Korpus sintetis: {n_docs} dokumen ---")
+    docs_tokens = synthetic_corpus.generate_corpus(
+        n_docs, args.doc_length, args.vocab_size, args.zipf, args.seed, root_words
+    )
+    repeat = [()] * args.repeat
+    memory = not args.no_memory
+    results = {}
+
+    # 1. Preprocessing (Sastrawi mahal: diukur per dokumen pada sampel)
+    sample_ids = list(docs_tokens.keys())[:args.preprocess_sample]
+    raw_texts = [(' '.join(docs_tokens[doc_id]),) for doc_id in sample_ids]
+    reset_stemmer_cache()
+    run_stage("preprocess_document", preprocess.preprocess_document, raw_texts, 1, "docs", memory, results)
+
+    # 2. Indexing (seluruh korpus per pemanggilan)
+    inverted_index = run_stage("build_inverted_index", lambda: boolean_ir.build_inverted_index(docs_tokens),
+                               repeat, n_docs, "docs", memory, results)
+    tf = run_stage("calculate_tf", lambda: vsm_ir.calculate_tf(docs_tokens), repeat, n_docs, "docs", memory, results)
+    df = run_stage("calculate_df", lambda: vsm_ir.calculate_df(docs_tokens), repeat, n_docs, "docs", memory, results)
+    run_stage("collect_index_statistics", lambda: collection_stats.collect_index_statistics(docs_tokens),
+              repeat, n_docs, "docs", memory, results)
+    run_stage("collect_statistics", lambda: collection_stats.collect_statistics(docs_tokens),
+              repeat, n_docs, "docs", memory, results)
+    idf = run_stage("calculate_idf", lambda: vsm_ir.calculate_idf(df, n_docs), repeat, len(df), "terms", memory, results)
+    tfidf_matrix = run_stage("build_tfidf_matrix", lambda: vsm_ir.build_tfidf_matrix(tf, idf, scheme='sublinear_tf'),
+                             repeat, n_docs, "docs", memory, results)
+    del tf
+
+    # 3. Query
+    boolean_queries, vsm_queries = make_queries(docs_tokens, args.queries, args.seed)
+    all_doc_ids = set(docs_tokens.keys())
+    run_stage("parse_and_execute_boolean_query", boolean_ir.parse_and_execute_boolean_query,
+              [(q, inverted_index, all_doc_ids) for q in boolean_queries], 1, "queries", memory, results)
+
+    query_vectors = [vsm_ir.vectorize_query(tokens, idf) for tokens in vsm_queries]
+    run_stage("rank_documents", vsm_ir.rank_documents,
+              [(tfidf_matrix, qv, args.k) for qv in query_vectors], 1, "queries", memory, results)
+
+    postings = vsm_ir.build_postings(tfidf_matrix)
+    doc_norms = vsm_ir.calculate_doc_norms(tfidf_matrix)
+    run_stage("rank_documents_batch", vsm_ir.rank_documents_batch,
+              [(postings, doc_norms, [qv], args.k) for qv in query_vectors], 1, "queries", memory, results)
+
+    return results
+
+# --- Baseline & Regresi ---
+
+def save_baseline(path, report):
+    parent = os.path.dirname(path)
+    if parent and not os.path.exists(parent):
+        os.makedirs(parent)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+    print(f"\nBaseline disimpan di {path}")
+
+def compare_with_baseline(report, baseline_path, tolerance):
+    """
+    Membandingkan p50 setiap tahap dengan baseline.
+    :return: List[str] daftar regresi (kosong jika aman)
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = []
+    print(f"\n--- Perbandingan dengan baseline {baseline_path} (toleransi {tolerance:.0%}) ---")
+    for size, stages in report["results"].items():
+        for stage, stats in stages.items():
+            old = baseline.get("results", {}).get(size, {}).get(stage)
+            if not old or not old.get("p50_ms"):
+                continue
+            ratio = stats["p50_ms"] / old["p50_ms"]
+            status = "REGRESI" if ratio > 1 + tolerance else "ok"
+            print(f"  [{size}] {stage.ljust(34)} {old['p50_ms']:.3f}ms -> {stats['p50_ms']:.3f}ms (x{ratio:.2f}) {status}")
+            if status == "REGRESI":
+                regressions.append(f"{size}/{stage}")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark pipeline EduKesehatan pada korpus sintetis.")
+    parser.add_argument('--sizes', default=','.join(str(n) for n in DEFAULT_SIZES),
+                        help="Daftar jumlah dokumen, dipisah koma (default: 1000,100000,1000000).")
+    parser.add_argument('--doc-length', type=int, default=80, help="Rata-rata panjang dokumen (token).")
+    parser.add_argument('--vocab-size', type=int, default=50000)
+    parser.add_argument('--zipf', type=float, default=1.07)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--random-roots', action='store_true', help="Kata dasar acak (bukan kamus Sastrawi).")
+    parser.add_argument('--repeat', type=int, default=3, help="Pengulangan tahap indexing.")
+    parser.add_argument('--queries', type=int, default=20, help="Jumlah query per model.")
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--preprocess-sample', type=int, default=200, help="Jumlah dokumen sampel untuk preprocessing.")
+    parser.add_argument('--no-memory', action='store_true', help="Lewati pengukuran peak memory.")
+    parser.add_argument('--output', default=os.path.join(DEFAULT_BASELINE_DIR, 'latest.json'),
+                        help="Path file JSON hasil benchmark.")
+    parser.add_argument('--compare', help="File baseline JSON untuk deteksi regresi.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Batas kenaikan p50 sebelum dianggap regresi.")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    report = {
+        "meta": {
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": vars(args),
+        },
+        "results": {},
+    }
+    root_words = None if args.random_roots else synthetic_corpus.load_root_words()
+    for n_docs in sizes:
+        report["results"][str(n_docs)] = benchmark_size(n_docs, args, root_words)
+        gc.collect()
+
+    # Bandingkan SEBELUM menyimpan: jika --output sama dengan --compare, baseline
+    # lama harus sudah dibaca sebelum ditimpa hasil run ini
+    regressions = compare_with_baseline(report, args.compare, args.tolerance) if args.compare else []
+    save_baseline(args.output, report)
+
+    if args.compare:
+        if regressions:
+            print(f"\n{len(regressions)} regresi terdeteksi: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nTidak ada regresi.")
@@ -0,0 +1,234 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+# Menambahkan path agar bisa impor modul dari root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.bench_pipeline import percentile
+
+"""
+Load tester: memutar ulang query log terhadap modul src.search.
+Termasuk:
+1. Pembaca query log ("model<TAB>query" atau query saja) / generator campuran
+2. Penjadwal open-loop pada target QPS dengan N worker konkuren
+3. Laporan latensi p50/p95/p99, throughput, dan memori per interval
+Jadwal open-loop berarti request tetap dikirim sesuai jadwal walau
+server melambat, sehingga antrean (tail latency) ikut terukur.
+"""
+
+MODELS = ('vsm', 'boolean')
+
+# Potongan query realistis untuk campuran sintetis (domain EduKesehatan)
+QUERY_TERMS = [
+    'gula', 'darah', 'diabetes', 'jantung', 'kolesterol', 'olahraga', 'makanan', 'sehat',
+    'tidur', 'air', 'putih', 'tangan', 'sabun', 'kuman', 'sarapan', 'stres', 'vitamin',
+    'imun', 'tekanan', 'gizi', 'buah', 'sayur', 'lemak', 'garam', 'obesitas', 'diab*',
+]
+
+# --- Sumber Query ---
+
+def load_query_log(path, default_model='vsm'):
+    """
+    Membaca query log. Format baris: "vsm<TAB>gula darah", "boolean<TAB>a and b",
+    atau hanya teks query (memakai default_model).
+    :return: List[Tuple[str, str]] -> [(model, query), ...]
+    """
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            model, sep, query = line.partition('\t')
+            if sep and model in MODELS:
+                entries.append((model, query.strip()))
+            else:
+                entries.append((default_model, line))
+    return entries
+
+def generate_query_mix(n_queries, boolean_ratio=0.3, seed=42):
+    """Campuran query VSM & Boolean sintetis (panjang query 1-4 term)."""
+    rng = random.Random(seed)
+    entries = []
+    for _ in range(n_queries):
+        terms = rng.sample(QUERY_TERMS, rng.randint(1, 4))
+        if rng.random() < boolean_ratio and len(terms) > 1:
+            operators = [rng.choice(['and', 'or', 'not']) for _ in terms[1:]]
+            query = terms[0] + ''.join(f" {op} {term}" for op, term in zip(operators, terms[1:]))
+            entries.append(('boolean', query))
+        else:
+            entries.append(('vsm', ' '.join(terms)))
+    return entries
+
+# --- Pemantau Memori ---
+
+def current_rss_mb():
+    """RSS proses saat ini (MB). Linux via /proc, selain itu via tracemalloc."""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+    return None
+
+# --- Load Tester ---
+
+class LoadTester:
+    """Memutar ulang query pada target QPS dan mencatat latensi per request."""
+
+    def __init__(self, search_module, workers=4, target_qps=50.0, k=10, scheme='sublinear_tf'):
+        self.search = search_module
+        self.workers = workers
+        self.target_qps = target_qps
+        self.k = k
+        self.scheme = scheme
+        self._lock = threading.Lock()
+        self.records = [] # (waktu_selesai, model, latensi_s, antrean_s, error)
+
+    def _execute(self, model, query, scheduled_at):
+        started_at = time.perf_counter()
+        error = None
+        try:
+            if model == 'boolean':
+                self.search.search_boolean(query)
+            else:
+                self.search.search_vsm(query, self.k, self.scheme)
+        except Exception as e: # Error dicatat, bukan menghentikan tes
+            error = repr(e)
+        finished_at = time.perf_counter()
+        with self._lock:
+            # Latensi dihitung dari jadwal kirim: waktu antre termasuk
+            self.records.append((finished_at, model, finished_at - scheduled_at, started_at - scheduled_at, error))
+
+    def run(self, entries, duration_s=None, interval_s=1.0):
+        """
+        Menjalankan tes. Query diputar berulang jika duration_s lebih
+        panjang dari log. Mengembalikan laporan (dict).
+        """
+        total = len(entries) if duration_s is None else int(duration_s * self.target_qps)
+        period = 1.0 / self.target_qps if self.target_qps > 0 else 0.0
+        timeline = []
+        stop_sampler = threading.Event()
+
+        def sample_memory(start):
+            while not stop_sampler.is_set():
+                with self._lock:
+                    completed = len(self.records)
+                timeline.append({"t_s": round(time.perf_counter() - start, 3),
+                                 "rss_mb": current_rss_mb(), "completed": completed})
+                stop_sampler.wait(interval_s)
+
+        start = time.perf_counter()
+        sampler = threading.Thread(target=sample_memory, args=(start,), daemon=True)
+        sampler.start()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for i in range(total):
+                scheduled_at = start + i * period
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                model, query = entries[i % len(entries)]
+                executor.submit(self._execute, model, query, scheduled_at)
+
+        elapsed = time.perf_counter() - start
+        stop_sampler.set()
+        sampler.join()
+        return self.report(elapsed, timeline)
+
+    def report(self, elapsed_s, timeline):
+        def latency_stats(latencies_s):
+            values = sorted(t * 1000 for t in latencies_s)
+            return {
+                "count": len(values),
+                "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+                "p50_ms": round(percentile(values, 50), 3),
+                "p95_ms": round(percentile(values, 95), 3),
+                "p99_ms": round(percentile(values, 99), 3),
+                "max_ms": round(values[-1], 3) if values else 0.0,
+            }
+
+        ok = [record for record in self.records if record[4] is None]
+        report = {
+            "target_qps": self.target_qps,
+            "workers": self.workers,
+            "requests": len(self.records),
+            "errors": len(self.records) - len(ok),
+            "elapsed_s": round(elapsed_s, 3),
+            "throughput_qps": round(len(ok) / elapsed_s, 3) if elapsed_s > 0 else 0.0,
+            "latency": latency_stats([record[2] for record in ok]),
+            "queue_wait": latency_stats([record[3] for record in ok]),
+            "by_model": {
+                model: latency_stats([record[2] for record in ok if record[1] == model])
+                for model in MODELS if any(record[1] == model for record in ok)
+            },
+            "timeline": timeline,
+        }
+        return report
+
+def print_report(report):
+    latency = report["latency"]
+    print(f"\n--- Hasil Load Test ({report['requests']} request, {report['workers']} worker) ---")
+    print(f"  Target QPS   : {report['target_qps']}")
+    print(f"  Throughput   : {report['throughput_qps']} qps  (error: {report['errors']})")
+    print(f"  Latensi      : p50={latency['p50_ms']}ms  p95={latency['p95_ms']}ms  "
+          f"p99={latency['p99_ms']}ms  max={latency['max_ms']}ms")
+    print(f"  Waktu antre  : p99={report['queue_wait']['p99_ms']}ms")
+    for model, stats in report["by_model"].items():
+        print(f"  [{model.ljust(7)}] p50={stats['p50_ms']}ms  p95={stats['p95_ms']}ms  p99={stats['p99_ms']}ms")
+    rss_values = [point["rss_mb"] for point in report["timeline"] if point["rss_mb"] is not None]
+    if rss_values:
+        print(f"  Memori (RSS) : {rss_values[0]:.1f}MB -> {rss_values[-1]:.1f}MB (maks {max(rss_values):.1f}MB)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load tester EduKesehatan (replay query log).")
+    parser.add_argument('--log', help="Query log: 'model<TAB>query' atau query per baris.")
+    parser.add_argument('--queries', type=int, default=500, help="Jumlah query campuran jika --log tidak diberikan.")
+    parser.add_argument('--boolean-ratio', type=float, default=0.3, help="Porsi query Boolean pada campuran sintetis.")
+    parser.add_argument('--qps', type=float, default=50.0, help="Target query per detik (0 = secepatnya).")
+    parser.add_argument('--workers', type=int, default=4, help="Jumlah worker konkuren.")
+    parser.add_argument('--duration', type=float, default=None, help="Durasi tes (detik), log diputar berulang.")
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--scheme', choices=['sublinear_tf', 'raw_tf'], default='sublinear_tf')
+    parser.add_argument('--warmup', type=int, default=20, help="Jumlah query pemanasan (tidak dicatat).")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Simpan laporan lengkap (termasuk timeline memori) ke JSON.")
+    args = parser.parse_args()
+
+    from src import search # Indeks dimuat saat impor
+
+    entries = load_query_log(args.log) if args.log else generate_query_mix(args.queries, args.boolean_ratio, args.seed)
+    if not entries:
+        print("Query log kosong.")
+        sys.exit(1)
+
+    # Pemanasan: cache stemmer & term dictionary terisi sebelum pengukuran
+    for model, query in entries[:args.warmup]:
+        if model == 'boolean':
+            search.search_boolean(query)
+        else:
+            search.search_vsm(query, args.k, args.scheme)
+
+    tester = LoadTester(search, args.workers, args.qps, args.k, args.scheme)
+    report = tester.run(entries, args.duration)
+    print_report(report)
+
+    if args.output:
+        parent = os.path.dirname(args.output)
+        if parent and not os.path.exists(parent):
+            os.makedirs(parent)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+        print(f"\nLaporan disimpan di {args.output}")
@@ -0,0 +1,107 @@
+import os
+import random
+import itertools
+
+"""
+Generator korpus sintetis "mirip Bahasa Indonesia" untuk benchmark.
+Termasuk:
+1. generate_vocabulary: kata dasar (kamus Sastrawi atau suku kata KV) + imbuhan (me-, ber-, -kan, ...)
+2. zipf_weights: distribusi frekuensi Zipf (kata ke-r muncul ~ 1 / r^s)
+3. generate_documents: dokumen dengan panjang acak di sekitar rata-rata tertentu
+Korpus bersifat deterministik untuk seed yang sama, sehingga hasil
+benchmark antar commit dapat dibandingkan.
+"""
+
+CONSONANTS = ['b', 'c', 'd', 'g', 'h', 'j', 'k', 'l', 'm', 'n', 'p', 'r', 's', 't', 'w', 'y', 'ng', 'ny']
+VOWELS = ['a', 'i', 'u', 'e', 'o']
+PREFIXES = ['', '', '', 'me', 'ber', 'di', 'ke', 'pe', 'ter', 'se']
+SUFFIXES = ['', '', '', 'kan', 'an', 'i', 'nya']
+
+# Sebagian kecil kata fungsi (stopword) agar tahap stopword removal ikut teruji
+FUNCTION_WORDS = ['yang', 'dan', 'di', 'ke', 'dari', 'untuk', 'dengan', 'pada', 'ini', 'itu']
+
+def load_root_words():
+    """
+    Kata dasar dari kamus Sastrawi (jika terpasang), agar biaya stemming
+    pada korpus sintetis mendekati teks asli. Kata di luar kamus jauh lebih
+    mahal untuk di-stem oleh Sastrawi.
+    :return: List[str] atau None
+    """
+    try:
+        from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+    except ImportError:
+        return None
+    words = [w.strip() for w in StemmerFactory().get_words() if w.strip().isalpha()]
+    return sorted(set(words)) or None
+
+def generate_vocabulary(size, seed=42, root_words=None):
+    """
+    Membangun vocabulary unik berukuran 'size'.
+    :param root_words: List[str] kata dasar (opsional), default suku kata acak
+    :return: List[str] (urutan = peringkat Zipf, kata fungsi di posisi teratas)
+    """
+    rng = random.Random(seed)
+    syllables = [c + v for c in CONSONANTS for v in VOWELS]
+    vocabulary = list(FUNCTION_WORDS[:size])
+    seen = set(vocabulary)
+
+    while len(vocabulary) < size:
+        if root_words:
+            root = rng.choice(root_words)
+        else:
+            root = ''.join(rng.choice(syllables) for _ in range(rng.randint(2, 3)))
+        word = rng.choice(PREFIXES) + root + rng.choice(SUFFIXES)
+        if word not in seen:
+            seen.add(word)
+            vocabulary.append(word)
+    return vocabulary
+
+def zipf_weights(size, s=1.07):
+    """Bobot kumulatif Zipf untuk random.choices(cum_weights=...)."""
+    return list(itertools.accumulate(1.0 / (rank ** s) for rank in range(1, size + 1)))
+
+def generate_documents(n_docs, mean_length=80, vocab_size=50000, zipf_s=1.07, seed=42, root_words=None):
+    """
+    Generator dokumen sintetis (streaming, hemat memori).
+
+    :return: Generator[Tuple[str, List[str]]] -> ("doc0000001.txt", ["kata", ...])
+    """
+    rng = random.Random(seed)
+    vocabulary = generate_vocabulary(vocab_size, seed, root_words)
+    cum_weights = zipf_weights(len(vocabulary), zipf_s)
+    width = max(7, len(str(n_docs)))
+
+    for i in range(1, n_docs + 1):
+        length = max(5, int(rng.gauss(mean_length, mean_length * 0.25)))
+        tokens = rng.choices(vocabulary, cum_weights=cum_weights, k=length)
+        yield f"doc{str(i).zfill(width)}.txt", tokens
+
+def generate_corpus(n_docs, mean_length=80, vocab_size=50000, zipf_s=1.07, seed=42, root_words=None):
+    """Versi dict dari generate_documents: {doc_id: List[str]}."""
+    return dict(generate_documents(n_docs, mean_length, vocab_size, zipf_s, seed, root_words))
+
+def write_corpus(output_dir, n_docs, mean_length=80, vocab_size=50000, zipf_s=1.07, seed=42, root_words=None):
+    """Menulis korpus sintetis sebagai file .txt (format sama dengan data/raw)."""
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    for doc_id, tokens in generate_documents(n_docs, mean_length, vocab_size, zipf_s, seed, root_words):
+        with open(os.path.join(output_dir, doc_id), 'w', encoding='utf-8') as f:
+            f.write(' '.join(tokens))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generator korpus sintetis untuk benchmark.")
+    parser.add_argument('--output-dir', required=True, help="Folder tujuan file .txt.")
+    parser.add_argument('--docs', type=int, default=1000, help="Jumlah dokumen.")
+    parser.add_argument('--doc-length', type=int, default=80, help="Rata-rata panjang dokumen (token).")
+    parser.add_argument('--vocab-size', type=int, default=50000, help="Ukuran vocabulary.")
+    parser.add_argument('--zipf', type=float, default=1.07, help="Eksponen Zipf.")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--random-roots', action='store_true', help="Jangan gunakan kamus Sastrawi sebagai kata dasar.")
+    args = parser.parse_args()
+
+    root_words = None if args.random_roots else load_root_words()
+    write_corpus(args.output_dir, args.docs, args.doc_length, args.vocab_size, args.zipf, args.seed, root_words)
+    print(f"{args.docs} dokumen sintetis ditulis ke {args.output_dir}")
@@ -4,6 +4,8 @@ import os
 # Menambahkan path agar bisa impor modul dari root
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src import preprocess # Diperlukan untuk memuat dokumen
+from src import term_index # Ekspansi wildcard & koreksi typo (opsional)
+from src import instrumentation
 
 """
 Modul ini berisi implementasi untuk Soal 03: Boolean Retrieval Model.
@@ -78,24 +80,42 @@ def build_inverted_index(docs_tokens):
             
     return inverted_index
 
-def parse_and_execute_boolean_query(query_str, index, all_doc_ids):
+def get_term_postings(term, index, term_dict=None):
     """
-    Parser Query Boolean sederhana: mendukung AND, OR, NOT.
-    (Langkah 3 Soal 03)
-    
-    Implementasi ini adalah parser linear sederhana dan tidak mendukung kurung.
-    Asumsi: 'term1 OPERATOR term2 OPERATOR term3 ...'
-    Contoh: "sehat AND olahraga NOT gula"
-    
-    :param query_str: String query, misal "cuci AND tangan OR sabun"
+    Mengambil postings list sebuah term (salinan, aman dimodifikasi).
+    Jika term_dict diberikan, term diekspansi dulu (wildcard/koreksi typo)
+    dan postings hasil ekspansi digabung (OR).
+    """
+    if term_dict is None:
+        postings = index.get(term, set()).copy()
+    else:
+        postings = set()
+        for expanded_term in term_dict.expand(term):
+            postings.update(index.get(expanded_term, ()))
+    instrumentation.count('postings_scanned', len(postings))
+    return postings
+
+def preprocess_boolean_query(query_str, term_dict=None):
+    """
+    Pre-process query Boolean: sama seperti dokumen.
+    Dipisah dari eksekusi agar query yang sama cukup diproses sekali (batch).
+
+    :return: List[str] token query (termasuk operator 'and'/'or'/'not')
+    """
+    if term_dict is None:
+        return preprocess.preprocess_document(query_str)
+    # Pola wildcard harus dipertahankan sebelum clean_text membuang '*'
+    return term_index.parse_query_terms(query_str)
+
+def execute_boolean_query(query_tokens_raw, index, term_dict=None):
+    """
+    Eksekusi token query Boolean secara linear (tanpa kurung).
+
+    :param query_tokens_raw: List[str] hasil preprocess_boolean_query
     :param index: Inverted Index (Dict[str, Set[str]])
-    :param all_doc_ids: Set[str] dari semua ID dokumen (untuk operasi NOT)
+    :param term_dict: TermDictionary (opsional)
     :return: List[str] dari doc_id yang cocok (diurutkan)
     """
-    
-    # Pre-process query: sama seperti dokumen
-    query_tokens_raw = preprocess.preprocess_document(query_str)
-    
     # Pisahkan operator dari term
     terms = []
     operators = []
@@ -110,7 +130,7 @@ def parse_and_execute_boolean_query(query_str, index, all_doc_ids):
         return []
 
     # Ambil postings list untuk term pertama
-    current_result_set = index.get(terms[0], set()).copy()
+    current_result_set = get_term_postings(terms[0], index, term_dict)
 
     # Proses sisa query secara linear
     # i digunakan untuk mengakses 'terms' (mulai dari term kedua)
@@ -123,7 +143,7 @@ def parse_and_execute_boolean_query(query_str, index, all_doc_ids):
         op = operators[operator_idx]
         term = terms[i]
         
-        term_postings = index.get(term, set()).copy()
+        term_postings = get_term_postings(term, index, term_dict)
         
         if op == 'AND':
             current_result_set.intersection_update(term_postings)
@@ -142,6 +162,24 @@ def parse_and_execute_boolean_query(query_str, index, all_doc_ids):
 
     return sorted(list(current_result_set))
 
+def parse_and_execute_boolean_query(query_str, index, all_doc_ids, term_dict=None):
+    """
+    Parser Query Boolean sederhana: mendukung AND, OR, NOT.
+    (Langkah 3 Soal 03)
+    
+    Implementasi ini adalah parser linear sederhana dan tidak mendukung kurung.
+    Asumsi: 'term1 OPERATOR term2 OPERATOR term3 ...'
+    Contoh: "sehat AND olahraga NOT gula"
+    
+    :param query_str: String query, misal "cuci AND tangan OR sabun"
+    :param index: Inverted Index (Dict[str, Set[str]])
+    :param all_doc_ids: Set[str] dari semua ID dokumen (untuk operasi NOT)
+    :param term_dict: TermDictionary (opsional) untuk ekspansi "diab*" / "kolestrol"
+    :return: List[str] dari doc_id yang cocok (diurutkan)
+    """
+    query_tokens_raw = preprocess_boolean_query(query_str, term_dict)
+    return execute_boolean_query(query_tokens_raw, index, term_dict)
+
 
 # --- Bagian Eksekusi (untuk pengujian mandiri) ---
 if __name__ == "__main__":
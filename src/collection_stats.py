@@ -0,0 +1,172 @@
+import math
+import heapq
+import bisect
+from operator import itemgetter
+from collections import Counter
+
+"""
+Modul ini berisi statistik koleksi yang dihitung dalam SATU lintasan indexing.
+Setiap dokumen dihitung sekali (Counter per dokumen), lalu dipakai bersama untuk:
+- TF per dokumen dan DF (untuk VSM / IDF)
+- Postings Boolean {term: Set[doc_id]} dari key Counter yang sama (opsional)
+- Collection frequency (CF) dan panjang dokumen (CF opsional)
+- Top-N token per dokumen (opsional, hasil sama dengan Counter.most_common)
+- Distribusi korpus (agregat berjalan: tidak menyimpan ulang semua token)
+Indexing pencarian (collect_index_statistics) menghitung semuanya sekaligus dan
+menyimpan hasilnya di metadata indeks, sehingga laporan tidak butuh lintasan lagi.
+"""
+
+DEFAULT_TOP_N = 10
+LENGTH_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+HEAP_MIN_ITEMS_PER_N = 20 # Di bawah ini, sort biasa lebih cepat daripada heap
+
+class CollectionStatistics:
+    """
+    Pengumpul statistik streaming. Panggil add() sekali per dokumen.
+
+    :param top_n: jumlah top token per dokumen (None = tidak dihitung)
+    :param collection_frequency: hitung CF
+    :param postings: bangun postings Boolean {term: Set[doc_id]} di lintasan yang sama
+
+    Contoh:
+        stats = CollectionStatistics()
+        for doc_id, tokens in docs_tokens.items():
+            stats.add(doc_id, tokens)
+        stats.tf, stats.df, stats.to_report()
+    """
+
+    def __init__(self, top_n=DEFAULT_TOP_N, collection_frequency=True, postings=False):
+        self.top_n = top_n
+        self.tf = {}          # {doc_id: Counter}
+        self._df = Counter()  # {term: jumlah dokumen}; mode postings: diturunkan dari postings
+        self.cf = Counter() if collection_frequency else None # {term: kemunculan di seluruh koleksi}
+        self.postings = {} if postings else None # {term: Set[doc_id]} (sama dengan build_inverted_index)
+        self.doc_lengths = {}
+        self.top_tokens = {} if top_n else None
+        self.n_docs = 0
+        self.total_tokens = 0
+        self.min_length = None
+        self.max_length = None
+        self._sum_sq_length = 0
+        self._length_histogram = Counter()
+
+    def add(self, doc_id, tokens):
+        """Menghitung satu dokumen. :return: Counter TF dokumen tersebut"""
+        counts = Counter(tokens)
+        length = len(tokens)
+
+        self.tf[doc_id] = counts
+        if self.postings is None:
+            self._df.update(counts.keys())
+        if self.cf is not None:
+            self.cf.update(tokens) # Iterable -> penghitungan di C (lebih cepat dari update(Counter))
+        if self.postings is not None:
+            postings = self.postings
+            for term in counts: # Term unik dokumen, tanpa melintasi token lagi
+                docs = postings.get(term)
+                if docs is None:
+                    postings[term] = {doc_id}
+                else:
+                    docs.add(doc_id)
+            self._df = None # DF dihitung ulang dari postings saat dibaca
+        self.doc_lengths[doc_id] = length
+        if self.top_tokens is not None:
+            self.top_tokens[doc_id] = top_items(counts, self.top_n)
+
+        self.n_docs += 1
+        self.total_tokens += length
+        self._sum_sq_length += length * length
+        self.min_length = length if self.min_length is None else min(self.min_length, length)
+        self.max_length = length if self.max_length is None else max(self.max_length, length)
+        self._length_histogram[length_bucket(length)] += 1
+        return counts
+
+    @property
+    def df(self):
+        """DF per term. Mode postings: len(postings[term]), dihitung sekali setelah add terakhir."""
+        if self._df is None:
+            self._df = Counter({term: len(docs) for term, docs in self.postings.items()})
+        return self._df
+
+    # --- Agregat Korpus ---
+
+    def distribution(self):
+        """Distribusi panjang dokumen (data untuk grafik)."""
+        if not self.n_docs:
+            return {}
+        mean = self.total_tokens / self.n_docs
+        variance = max(0.0, self._sum_sq_length / self.n_docs - mean * mean)
+        return {
+            "mean": mean,
+            "min": self.min_length,
+            "max": self.max_length,
+            "std": math.sqrt(variance),
+            "histogram": {label: self._length_histogram[label] for label in bucket_labels()
+                          if self._length_histogram[label]},
+        }
+
+    def summary(self, top_terms=DEFAULT_TOP_N):
+        """Ringkasan tingkat korpus (cukup kecil untuk metadata indeks). Key CF hanya jika CF dihitung."""
+        summary = {
+            "documents": self.n_docs,
+            "total_tokens": self.total_tokens,
+            "vocabulary_size": len(self.df),
+            "doc_length": self.distribution(),
+            "top_terms_by_df": top_items(self.df, top_terms),
+        }
+        if self.cf is not None:
+            summary["hapax_legomena"] = sum(1 for count in self.cf.values() if count == 1)
+            summary["top_terms_by_cf"] = top_items(self.cf, top_terms)
+        return summary
+
+    def document_statistics(self):
+        """Statistik per dokumen: panjang dan top-N token (jika dihitung)."""
+        statistics = {"doc_lengths": dict(self.doc_lengths)}
+        if self.top_tokens is not None:
+            statistics[f"top_{self.top_n}_tokens"] = dict(self.top_tokens)
+        return statistics
+
+    def to_report(self):
+        """Format reports/statistics.json (Uji Soal 2) + ringkasan koleksi."""
+        report = self.document_statistics()
+        if self.n_docs:
+            report["distribution"] = self.distribution()
+            report["collection"] = self.summary()
+        return report
+
+def top_items(counts, n):
+    """
+    N item dengan hitungan terbesar; urutan seri sama dengan Counter.most_common.
+    Dokumen panjang memakai heap terbatas (O(m log n)); dokumen pendek cukup
+    diurutkan karena lebih cepat untuk m kecil.
+    """
+    if len(counts) > HEAP_MIN_ITEMS_PER_N * n:
+        return heapq.nlargest(n, counts.items(), key=itemgetter(1))
+    return sorted(counts.items(), key=itemgetter(1), reverse=True)[:n]
+
+def length_bucket(length):
+    """Label bucket histogram panjang dokumen, misal '<=100' atau '>10000'."""
+    i = bisect.bisect_left(LENGTH_BUCKETS, length)
+    return f"<={LENGTH_BUCKETS[i]}" if i < len(LENGTH_BUCKETS) else f">{LENGTH_BUCKETS[-1]}"
+
+def bucket_labels():
+    return [f"<={bound}" for bound in LENGTH_BUCKETS] + [f">{LENGTH_BUCKETS[-1]}"]
+
+def collect_statistics(docs_tokens, top_n=DEFAULT_TOP_N, collection_frequency=True, postings=False):
+    """
+    Satu lintasan atas seluruh dokumen.
+    :param docs_tokens: Dict[str, List[str]]
+    :return: CollectionStatistics
+    """
+    stats = CollectionStatistics(top_n, collection_frequency, postings)
+    for doc_id, tokens in docs_tokens.items():
+        stats.add(doc_id, tokens)
+    return stats
+
+def collect_index_statistics(docs_tokens, top_n=DEFAULT_TOP_N):
+    """
+    Lintasan indexing pencarian: postings Boolean, TF, DF, CF, panjang dokumen,
+    top-N token per dokumen, dan distribusi korpus dari Counter per dokumen yang sama.
+    :return: CollectionStatistics (stats.postings menggantikan build_inverted_index)
+    """
+    return collect_statistics(docs_tokens, top_n=top_n, collection_frequency=True, postings=True)
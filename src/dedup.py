@@ -0,0 +1,263 @@
+import sys
+import os
+import time
+import zlib
+import random
+import argparse
+import numpy as np
+
+# Menambahkan path agar bisa impor modul dari root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+"""
+Modul ini berisi deteksi near-duplicate (artikel sindikasi / sedikit diubah) saat indexing.
+Termasuk:
+1. Shingling: himpunan n-gram token (hash 32-bit)
+2. MinHash: signature berukuran tetap yang mengestimasi Jaccard antar dokumen
+3. LSH banding: anggota bucket dibandingkan dengan representatif klaster di bucket
+   itu dan diverifikasi dengan estimasi Jaccard dari signature
+4. Klaster (union-find) -> satu representatif per klaster, sisanya jadi pointer
+"""
+
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 3
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+# --- Shingling & MinHash ---
+
+def shingle_hashes(tokens, size=DEFAULT_SHINGLE_SIZE):
+    """Hash 32-bit (crc32) dari setiap n-gram token unik dalam dokumen."""
+    if len(tokens) < size:
+        grams = {' '.join(tokens)} if tokens else set()
+    else:
+        grams = {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+    return np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams), dtype=np.uint64, count=len(grams))
+
+def make_permutations(num_perm=DEFAULT_NUM_PERM, seed=1):
+    """Parameter hash universal (a*x + b) mod p untuk setiap permutasi."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 32, num_perm, dtype=np.uint64)
+    b = rng.integers(0, 1 << 32, num_perm, dtype=np.uint64)
+    return a, b
+
+def minhash_signature(hashes, permutations):
+    """
+    :param hashes: np.ndarray uint64 dari shingle_hashes
+    :return: np.ndarray uint64 (num_perm,) -> nilai minimum per permutasi
+    """
+    a, b = permutations
+    if len(hashes) == 0:
+        return np.full(len(a), MAX_HASH, dtype=np.uint64)
+    # hash < 2^32 dan a, b < 2^32, sehingga a*x + b tidak overflow uint64
+    return (((hashes[:, None] * a + b) % MERSENNE_PRIME) & MAX_HASH).min(axis=0)
+
+def choose_bands(num_perm, threshold):
+    """
+    Pilih (bands, rows) dengan bands * rows = num_perm sehingga titik belok
+    kurva LSH (1/bands)^(1/rows) paling dekat dengan threshold.
+    """
+    options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(options, key=lambda br: abs((1.0 / br[0]) ** (1.0 / br[1]) - threshold))
+
+# --- LSH & Klaster ---
+
+def is_near_duplicate(signatures, i, j, threshold):
+    """Verifikasi: proporsi nilai MinHash yang sama = estimasi Jaccard."""
+    return np.mean(signatures[i] == signatures[j]) >= threshold
+
+def lsh_duplicate_pairs(signatures, bands, rows, threshold):
+    """
+    Pasangan near-duplicate terverifikasi dari bucket LSH. Setiap bucket menyimpan
+    representatif klaster: anggota baru dibandingkan dengan representatif yang
+    sudah ada (berhenti di yang pertama cocok), dan menjadi representatif baru jika
+    tidak ada yang cocok. Tabrakan palsu di bucket tidak menghalangi duplikat asli
+    saling bertemu, sedangkan bucket berisi satu klaster tetap linear.
+    Dokumen kosong (signature MAX_HASH semua) tidak dimasukkan ke bucket,
+    agar tidak dianggap duplikat satu sama lain.
+
+    :param signatures: np.ndarray (n_docs x num_perm)
+    :return: Set[Tuple[int, int]] pasangan (representatif, anggota), representatif < anggota
+    """
+    doc_indices = np.flatnonzero(~(signatures == MAX_HASH).all(axis=1))
+    pairs = set()
+    for band in range(bands):
+        representatives = {} # {kunci bucket: [indeks dokumen representatif]}
+        band_slice = signatures[:, band * rows:(band + 1) * rows]
+        for doc_idx in doc_indices.tolist():
+            bucket = representatives.setdefault(band_slice[doc_idx].tobytes(), [])
+            for rep in bucket:
+                if (rep, doc_idx) in pairs or is_near_duplicate(signatures, rep, doc_idx, threshold):
+                    pairs.add((rep, doc_idx))
+                    break
+            else:
+                bucket.append(doc_idx)
+    return pairs
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]] # Path halving
+        i = parent[i]
+    return i
+
+def find_near_duplicates(docs_tokens, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM,
+                         shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+    """
+    Mencari klaster near-duplicate.
+
+    :param docs_tokens: Dict[str, List[str]] token dokumen terproses
+    :return: Dict[str, List[str]] -> {doc_representatif: [doc_duplikat, ...]}
+             Representatif = dokumen terpanjang di klaster (seri: doc_id terkecil).
+    """
+    doc_ids = sorted(docs_tokens.keys())
+    if len(doc_ids) < 2:
+        return {}
+
+    permutations = make_permutations(num_perm, seed)
+    signatures = np.vstack([
+        minhash_signature(shingle_hashes(docs_tokens[doc_id], shingle_size), permutations)
+        for doc_id in doc_ids
+    ])
+
+    bands, rows = choose_bands(num_perm, threshold)
+    parent = list(range(len(doc_ids)))
+    for i, j in lsh_duplicate_pairs(signatures, bands, rows, threshold):
+        root_i, root_j = _find(parent, i), _find(parent, j)
+        if root_i != root_j:
+            parent[root_j] = root_i
+
+    members_by_root = {}
+    for i in range(len(doc_ids)):
+        members_by_root.setdefault(_find(parent, i), []).append(doc_ids[i])
+
+    clusters = {}
+    for members in members_by_root.values():
+        if len(members) > 1:
+            members.sort(key=lambda doc_id: (-len(docs_tokens[doc_id]), doc_id))
+            clusters[members[0]] = members[1:]
+    return clusters
+
+def collapse_duplicates(docs_tokens, clusters):
+    """Hanya representatif yang diindeks; duplikat dibuang dari docs_tokens."""
+    duplicate_ids = {doc_id for duplicates in clusters.values() for doc_id in duplicates}
+    return {doc_id: tokens for doc_id, tokens in docs_tokens.items() if doc_id not in duplicate_ids}
+
+def threshold_from_env(value=None):
+    """
+    Threshold dedup dari env EDUKES_DEDUP ("1" = DEFAULT_THRESHOLD, angka = threshold).
+    Nilai yang tidak valid (bukan angka atau di luar (0, 1]) memakai DEFAULT_THRESHOLD.
+    :return: float atau None jika dedup tidak aktif
+    """
+    value = (os.environ.get('EDUKES_DEDUP', '') if value is None else value).strip()
+    if value in ('', '0'):
+        return None
+    if value == '1':
+        return DEFAULT_THRESHOLD
+    try:
+        threshold = float(value)
+    except ValueError:
+        threshold = None
+    if threshold is None or not 0 < threshold <= 1:
+        print(f"EDUKES_DEDUP='{value}' tidak valid, memakai threshold {DEFAULT_THRESHOLD}.")
+        return DEFAULT_THRESHOLD
+    return threshold
+
+# --- Laporan Dampak ---
+
+def inject_near_duplicates(docs_tokens, dup_rate=0.3, edit_rate=0.02, seed=42):
+    """Salinan sindikasi sintetis: sebagian token diganti token acak dari korpus."""
+    rng = random.Random(seed)
+    vocabulary = sorted({token for tokens in docs_tokens.values() for token in tokens})
+    result = dict(docs_tokens)
+    for doc_id in sorted(docs_tokens.keys()):
+        if rng.random() < dup_rate:
+            copy = [rng.choice(vocabulary) if rng.random() < edit_rate else token for token in docs_tokens[doc_id]]
+            result[f"{os.path.splitext(doc_id)[0]}_copy.txt"] = copy
+    return result
+
+def measure_index(docs_tokens, queries, k=10):
+    """Ukuran flat index, jumlah postings, dan latensi scoring rata-rata (ms) untuk satu korpus."""
+    from src import boolean_ir, vsm_ir, flat_index
+
+    inverted_index = boolean_ir.build_inverted_index(docs_tokens)
+    tf = vsm_ir.calculate_tf(docs_tokens)
+    idf = vsm_ir.calculate_idf(vsm_ir.calculate_df(docs_tokens), len(docs_tokens))
+    tfidf_matrix = vsm_ir.build_tfidf_matrix(tf, idf, scheme='sublinear_tf')
+    index_bytes = flat_index.build_flat_index(
+        inverted_index, idf, {'sublinear_tf': tfidf_matrix},
+        {'sublinear_tf': vsm_ir.calculate_doc_norms(tfidf_matrix)},
+        doc_ids=docs_tokens.keys(),
+    )
+    flat = flat_index.FlatIndex(index_bytes)
+
+    query_vectors = [vsm_ir.vectorize_query(tokens, idf, scheme='sublinear_tf') for tokens in queries]
+    start = time.perf_counter()
+    for query_vector in query_vectors:
+        flat.rank(query_vector, k, 'sublinear_tf')
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    flat.release()
+    return {
+        "documents": len(docs_tokens),
+        "postings": sum(len(doc_ids) for doc_ids in inverted_index.values()),
+        "index_bytes": len(index_bytes),
+        "query_ms": elapsed_ms / max(1, len(queries)),
+    }
+
+def dedup_report(docs_tokens, threshold=DEFAULT_THRESHOLD, n_queries=500, seed=42):
+    """Bandingkan indeks tanpa vs dengan dedup: ukuran & waktu query."""
+    start = time.perf_counter()
+    clusters = find_near_duplicates(docs_tokens, threshold)
+    dedup_s = time.perf_counter() - start
+    collapsed = collapse_duplicates(docs_tokens, clusters)
+
+    # Query diambil dari token korpus agar semua model mendapat beban yang sama
+    rng = random.Random(seed)
+    pool = [tokens for tokens in docs_tokens.values() if tokens]
+    queries = [rng.sample(tokens, min(len(tokens), rng.randint(1, 4))) for tokens in rng.choices(pool, k=n_queries)]
+
+    before = measure_index(docs_tokens, queries)
+    after = measure_index(collapsed, queries)
+    return {
+        "threshold": threshold,
+        "clusters": len(clusters),
+        "duplicates_removed": len(docs_tokens) - len(collapsed),
+        "dedup_seconds": round(dedup_s, 3),
+        "before": before,
+        "after": after,
+        "index_saved_pct": round(100 * (1 - after["index_bytes"] / before["index_bytes"]), 2),
+        "query_time_drop_pct": round(100 * (1 - after["query_ms"] / before["query_ms"]), 2) if before["query_ms"] else 0.0,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Deteksi near-duplicate (MinHash/LSH) & dampaknya pada indeks.")
+    parser.add_argument('--doc-dir', default=os.path.join(os.path.dirname(__file__), '..', 'data', 'processed'),
+                        help="Folder dokumen terproses.")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Batas estimasi Jaccard.")
+    parser.add_argument('--synthetic-docs', type=int, default=0, help="Pakai korpus sintetis berukuran N (bukan --doc-dir).")
+    parser.add_argument('--dup-rate', type=float, default=0.0, help="Porsi dokumen yang diberi salinan sintetis.")
+    parser.add_argument('--edit-rate', type=float, default=0.02, help="Porsi token yang diubah pada salinan.")
+    parser.add_argument('--queries', type=int, default=500)
+    args = parser.parse_args()
+
+    if args.synthetic_docs:
+        from benchmarks.synthetic_corpus import generate_corpus
+        docs_tokens = generate_corpus(args.synthetic_docs)
+    else:
+        from src import preprocess
+        docs_tokens = {doc_id: preprocess.tokenize(text) for doc_id, text in preprocess.load_documents(args.doc_dir).items()}
+    if args.dup_rate > 0:
+        docs_tokens = inject_near_duplicates(docs_tokens, args.dup_rate, args.edit_rate)
+
+    report = dedup_report(docs_tokens, args.threshold, args.queries)
+    before, after = report["before"], report["after"]
+    print(f"\n--- Near-Duplicate (MinHash/LSH, threshold {report['threshold']}) ---")
+    print(f"  Klaster            : {report['clusters']} (dokumen digabung: {report['duplicates_removed']}, {report['dedup_seconds']} s)")
+    print(f"  Dokumen terindeks  : {before['documents']} -> {after['documents']}")
+    print(f"  Postings           : {before['postings']} -> {after['postings']}")
+    print(f"  Ukuran indeks      : {before['index_bytes'] / 1024:.1f} KB -> {after['index_bytes'] / 1024:.1f} KB "
+          f"(hemat {report['index_saved_pct']}%)")
+    print(f"  Waktu query (rata2): {before['query_ms']:.3f} ms -> {after['query_ms']:.3f} ms "
+          f"(turun {report['query_time_drop_pct']}%)")
@@ -1,13 +1,19 @@
 import math
 import sys
 import os
+import time
+import argparse
+import numpy as np
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 # Menambahkan path src agar dapat mengimpor modul search
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 # Impor fungsi pencarian aktual dari modul Anda
 try:
-    from src.search import search_vsm, search_boolean
+    from src.search import search_vsm, search_boolean, search_lsa, search_vsm_batch, search_boolean_batch, search_lsa_batch, get_lsa_model
+    from src import trec_io
 except ImportError:
     print("Error: Gagal mengimpor modul 'src.search'. Pastikan file ada dan benar.")
     sys.exit(1)
@@ -103,6 +109,255 @@ def ndcg_at_k(retrieved_docs, relevant_docs_graded, k=10):
         return dcg / idcg
 
 
+def reciprocal_rank(retrieved_docs, relevant_docs):
+    """Menghitung Reciprocal Rank (1 / rank dokumen relevan pertama)."""
+    relevant_set = set(relevant_docs)
+    for i, doc_id in enumerate(retrieved_docs):
+        if doc_id in relevant_set:
+            return 1.0 / (i + 1)
+    return 0.0
+
+def recall_at_k(retrieved_docs, relevant_docs, k=10):
+    """Menghitung Recall@k."""
+    relevant_set = set(relevant_docs)
+    if not relevant_set:
+        return 0.0
+    return len(relevant_set.intersection(retrieved_docs[:k])) / len(relevant_set)
+
+
+# --- 2b. Metrik Tervektorisasi (NumPy, untuk Ribuan Query) ---
+
+def build_relevance_matrices(run, qrels, k):
+    """
+    Menyusun matriks gain berukuran (jumlah_query x k) dari run & qrels.
+    Baris = query (urutan qid di qrels), kolom = posisi ranking.
+
+    :param run: Dict[str, List[str]] -> {qid: [doc_id terurut]}
+    :param qrels: Dict[str, Dict[str, int]] -> {qid: {doc_id: relevansi}}
+    :return: Tuple (qids, gains, ideal_gains, n_relevant)
+    """
+    qids = list(qrels.keys())
+    gains = np.zeros((len(qids), k), dtype=np.float64)
+    ideal_gains = np.zeros((len(qids), k), dtype=np.float64)
+    n_relevant = np.zeros(len(qids), dtype=np.float64)
+
+    for row, qid in enumerate(qids):
+        judgments = qrels[qid]
+        retrieved_at_k = run.get(qid, [])[:k]
+        gains[row, :len(retrieved_at_k)] = [judgments.get(doc_id, 0) for doc_id in retrieved_at_k]
+
+        positive = sorted((rel for rel in judgments.values() if rel > 0), reverse=True)
+        n_relevant[row] = len(positive)
+        ideal_gains[row, :min(k, len(positive))] = positive[:k]
+
+    return qids, gains, ideal_gains, n_relevant
+
+def count_set_hits(run, qrels, qids):
+    """
+    Jumlah dokumen unik yang diambil & yang relevan di SELURUH run per query.
+    Berbasis himpunan (seperti precision_recall_f1), tanpa matriks selebar hasil
+    terpanjang, sehingga aman untuk hasil Boolean OR yang sangat lebar.
+
+    :return: Tuple (n_retrieved, hits) -> np.ndarray per query
+    """
+    n_retrieved = np.zeros(len(qids), dtype=np.float64)
+    hits = np.zeros(len(qids), dtype=np.float64)
+    for row, qid in enumerate(qids):
+        judgments = qrels[qid]
+        retrieved_set = set(run.get(qid, []))
+        n_retrieved[row] = len(retrieved_set)
+        hits[row] = sum(1 for doc_id in retrieved_set if judgments.get(doc_id, 0) > 0)
+    return n_retrieved, hits
+
+def compute_metrics_vectorized(gains, ideal_gains, n_relevant, n_retrieved, set_hits):
+    """
+    Menghitung P, R, F1 (berbasis himpunan, seluruh run) serta AP@k, nDCG@k,
+    RR, dan Recall@k (dari matriks gain top-k) untuk semua query sekaligus.
+    Definisi identik dengan versi skalar di atas.
+
+    :return: Dict[str, np.ndarray], satu nilai per query
+    """
+    k = gains.shape[1]
+    binary = (gains > 0).astype(np.float64)
+    ranks = np.arange(1, k + 1, dtype=np.float64)
+    discounts = 1.0 / np.log2(ranks + 1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(n_retrieved > 0, set_hits / n_retrieved, 0.0)
+        recall = np.where(n_relevant > 0, set_hits / n_relevant, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+        hits_at_k = binary.sum(axis=1)
+        recall_at_k = np.where(n_relevant > 0, hits_at_k / n_relevant, 0.0)
+
+        precision_at_i = np.cumsum(binary, axis=1) / ranks
+        average_precision = np.where(n_relevant > 0, (precision_at_i * binary).sum(axis=1) / n_relevant, 0.0)
+
+        dcg = (gains * discounts).sum(axis=1)
+        idcg = (ideal_gains * discounts).sum(axis=1)
+        ndcg = np.where(idcg > 0, dcg / idcg, 0.0)
+
+    first_hit = binary.argmax(axis=1)
+    reciprocal = np.where(hits_at_k > 0, 1.0 / (first_hit + 1), 0.0)
+
+    return {
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "ap": average_precision,
+        "ndcg": ndcg,
+        "rr": reciprocal,
+        "recall_at_k": recall_at_k,
+    }
+
+
+# --- 2c. Retrieval Paralel (Worker Pool) ---
+
+def _retrieve_one(task):
+    """Worker: menjalankan satu query dan mengukur latensinya (ms)."""
+    qid, query, model, k, scheme = task
+    start = time.perf_counter()
+    if model == 'boolean':
+        results = search_boolean(query)
+    elif model == 'lsa':
+        results = search_lsa(query, k, scheme)
+    else:
+        results = search_vsm(query, k, scheme)
+    latency_ms = (time.perf_counter() - start) * 1000
+    return qid, [(doc_id, score) for doc_id, score, _ in results], latency_ms
+
+def _pool_context():
+    """Konteks fork jika tersedia (default spawn/forkserver akan mengimpor & membangun ulang indeks)."""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+def run_retrieval_parallel(queries, model='vsm', k=10, scheme='sublinear_tf', workers=None):
+    """
+    Menjalankan retrieval untuk banyak query di process pool.
+    Indeks sudah dimuat oleh src.search sebelum pool dibuat, sehingga
+    worker (fork) mewarisinya tanpa membangun ulang. Platform tanpa fork
+    memakai start method bawaan (setiap worker memuat indeks sendiri).
+
+    :param queries: Dict[str, str] -> {qid: query}
+    :param workers: jumlah proses (None = jumlah CPU, 1 = serial)
+    :return: Tuple (run_results, latencies)
+             run_results: Dict[str, List[Tuple[str, float]]]
+             latencies: Dict[str, float] (ms per query)
+    """
+    tasks = [(qid, query, model, k, scheme) for qid, query in queries.items()]
+    run_results, latencies = {}, {}
+    if model == 'lsa':
+        get_lsa_model(scheme=scheme) # SVD dihitung sekali di induk, lalu diwarisi worker
+
+    if workers == 1:
+        outputs = map(_retrieve_one, tasks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+        chunksize = max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 4))
+        outputs = executor.map(_retrieve_one, tasks, chunksize=chunksize)
+
+    try:
+        for qid, results, latency_ms in outputs:
+            run_results[qid] = results
+            latencies[qid] = latency_ms
+    finally:
+        if workers != 1:
+            executor.shutdown()
+    return run_results, latencies
+
+def gold_set_to_qrels_and_queries(gold_set=None):
+    """Konversi GOLD_SET bawaan ke format qrels & queries."""
+    gold_set = gold_set or GOLD_SET
+    qrels = {q_id: dict(data["relevant_docs_graded"]) for q_id, data in gold_set.items()}
+    queries = {q_id: data["query"] for q_id, data in gold_set.items()}
+    return qrels, queries
+
+def evaluate_run(run, qrels, k=10, latencies=None):
+    """
+    Evaluasi run terhadap qrels secara tervektorisasi.
+
+    :param run: Dict[str, List[str]] -> {qid: [doc_id terurut]}
+    :param latencies: Dict[str, float] (opsional) latensi retrieval per query (ms)
+    :return: Tuple (per_query_rows, aggregate)
+    """
+    qids, gains, ideal_gains, n_relevant = build_relevance_matrices(run, qrels, k)
+    n_retrieved, set_hits = count_set_hits(run, qrels, qids)
+    metrics = compute_metrics_vectorized(gains, ideal_gains, n_relevant, n_retrieved, set_hits)
+
+    per_query_rows = []
+    for row, qid in enumerate(qids):
+        entry = {"qid": qid, "retrieved": int(n_retrieved[row]), "relevant": int(n_relevant[row])}
+        for name, values in metrics.items():
+            entry[name] = round(float(values[row]), 6)
+        if latencies is not None:
+            latency_ms = latencies.get(qid)
+            entry["latency_ms"] = round(latency_ms, 3) if latency_ms is not None else None # null di JSON
+        per_query_rows.append(entry)
+
+    aggregate = {"queries": len(qids), "k": k}
+    names = {"precision": "P", "recall": "R", "f1": "F1", "ap": f"MAP@{k}",
+             "ndcg": f"nDCG@{k}", "rr": "MRR", "recall_at_k": f"Recall@{k}"}
+    for name, values in metrics.items():
+        aggregate[names[name]] = round(float(values.mean()), 6) if len(values) else 0.0
+
+    if latencies:
+        latency_values = np.array(list(latencies.values()), dtype=np.float64)
+        aggregate["latency_ms"] = {
+            "mean": round(float(latency_values.mean()), 3),
+            "p50": round(float(np.percentile(latency_values, 50)), 3),
+            "p95": round(float(np.percentile(latency_values, 95)), 3),
+            "p99": round(float(np.percentile(latency_values, 99)), 3),
+            "max": round(float(latency_values.max()), 3),
+        }
+    return per_query_rows, aggregate
+
+def run_trec_evaluation(qrels_path=None, queries_path=None, run_path=None, model='vsm',
+                        scheme='sublinear_tf', k=10, workers=None, output_dir='reports/eval',
+                        save_run=None):
+    """
+    Harness evaluasi skala besar berbasis file TREC.
+    - Jika run_path diberikan: run dievaluasi langsung (tanpa retrieval).
+    - Jika tidak: query dijalankan paralel, latensi dicatat per query.
+    Hasil per query & agregat ditulis ke JSON dan CSV di output_dir.
+    """
+    if qrels_path:
+        qrels = trec_io.load_qrels(qrels_path)
+        queries = trec_io.load_queries(queries_path) if queries_path else {}
+    else:
+        qrels, queries = gold_set_to_qrels_and_queries()
+
+    latencies = None
+    if run_path:
+        run = trec_io.load_run(run_path)
+        label = os.path.splitext(os.path.basename(run_path))[0]
+    else:
+        if not queries:
+            raise ValueError("Butuh --queries (qid<TAB>query) untuk menjalankan retrieval.")
+        run_results, latencies = run_retrieval_parallel(queries, model, k, scheme, workers)
+        run = {qid: [doc_id for doc_id, _ in results] for qid, results in run_results.items()}
+        label = model if model == 'boolean' else f"{model}_{scheme}"
+        if save_run:
+            trec_io.write_run(save_run, run_results, tag=label)
+
+    # P/R/F1 selalu dihitung atas seluruh hasil (termasuk Boolean yang tidak meranking);
+    # metrik ranking memakai kedalaman k
+    per_query_rows, aggregate = evaluate_run(run, qrels, k, latencies)
+    aggregate["run"] = label
+
+    json_path = os.path.join(output_dir, f"{label}.json")
+    csv_path = os.path.join(output_dir, f"{label}_per_query.csv")
+    trec_io.write_json(json_path, {"aggregate": aggregate, "per_query": per_query_rows})
+    trec_io.write_csv(csv_path, per_query_rows)
+
+    print(f"Hasil evaluasi '{label}' ({aggregate['queries']} query):")
+    for name, value in aggregate.items():
+        if name not in ("run", "queries", "k"):
+            print(f"  {name.ljust(12)}: {value}")
+    print(f"Disimpan di {json_path} dan {csv_path}")
+    return per_query_rows, aggregate
+
+
 # --- 3. Orkestrasi Evaluasi (DIMODIFIKASI) ---
 
 def run_evaluation():
@@ -119,11 +374,16 @@ def run_evaluation():
     print("\n--- 1. Evaluasi Boolean Retrieval (Soal 3) ---")
     total_precision, total_recall, total_f1 = 0, 0, 0
     
-    for q_id, data in GOLD_SET.items():
+    # Semua query dieksekusi dalam satu batch (preprocessing sekali per query)
+    query_ids = list(GOLD_SET.keys())
+    queries = [GOLD_SET[q_id]["query"] for q_id in query_ids]
+    boolean_results = search_boolean_batch(queries)
+    
+    for q_id, retrieved_results in zip(query_ids, boolean_results):
+        data = GOLD_SET[q_id]
         query = data["query"]
         relevant_docs_set = set(data["relevant_docs_graded"].keys())
         
-        retrieved_results = search_boolean(query)
         retrieved_doc_ids = [doc_id for doc_id, score, _ in retrieved_results]
         
         p, r, f1 = precision_recall_f1(retrieved_doc_ids, relevant_docs_set)
@@ -140,20 +400,23 @@ def run_evaluation():
     # Tentukan skema yang akan diuji (Soal 5.1)
     schemes_to_test = ['sublinear_tf', 'raw_tf']
     results_by_scheme = {}
+    
+    # Satu batch untuk semua query & skema (satu lintasan postings per skema)
+    vsm_results = search_vsm_batch(queries, k=k, schemes=schemes_to_test)
+    # LSA (ruang laten dari TF-IDF sublinear_tf) diuji dengan metrik yang sama sebagai pembanding
+    vsm_results['lsa'] = search_lsa_batch(queries, k=k)
 
-    for scheme in schemes_to_test:
+    for scheme in schemes_to_test + ['lsa']:
         print(f"\n  Menguji Skema: '{scheme}' ...")
         
         list_of_ap = []
         list_of_ndcg = []
         
-        for q_id, data in GOLD_SET.items():
-            query = data["query"]
+        for q_id, retrieved_results in zip(query_ids, vsm_results[scheme]):
+            data = GOLD_SET[q_id]
             relevant_docs_graded = data["relevant_docs_graded"]
             relevant_docs_binary = {doc_id for doc_id, score in relevant_docs_graded.items() if score > 0}
 
-            # Panggil search_vsm dengan skema yang benar
-            retrieved_results = search_vsm(query, k=k, scheme=scheme)
             retrieved_doc_ids = [doc_id for doc_id, score, _ in retrieved_results]
             
             ap_score = average_precision_at_k(retrieved_doc_ids, relevant_docs_binary, k)
@@ -183,6 +446,22 @@ def run_evaluation():
 
 
 if __name__ == "__main__":
-    print("Menjalankan modul evaluasi sebagai script utama...")
-    print("Pastikan semua model telah dimuat oleh search.py...")
-    run_evaluation()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Evaluasi EduKesehatan (GOLD_SET atau file TREC).")
+    parser.add_argument('--qrels', help="File qrels TREC. Tanpa opsi apa pun, evaluasi GOLD_SET klasik dijalankan.")
+    parser.add_argument('--queries', help="File query 'qid<TAB>query' untuk retrieval.")
+    parser.add_argument('--run', help="File run TREC yang sudah ada (lewati retrieval).")
+    parser.add_argument('--model', choices=['boolean', 'vsm', 'lsa'], default='vsm')
+    parser.add_argument('--scheme', choices=['sublinear_tf', 'raw_tf'], default='sublinear_tf')
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses worker (1 = serial).")
+    parser.add_argument('--output-dir', default='reports/eval', help="Folder output JSON/CSV.")
+    parser.add_argument('--save-run', help="Simpan hasil retrieval sebagai file run TREC.")
+    args = parser.parse_args()
+
+    if not any([args.qrels, args.queries, args.run]):
+        print("Menjalankan modul evaluasi sebagai script utama...")
+        print("Pastikan semua model telah dimuat oleh search.py...")
+        run_evaluation()
+    else:
+        run_trec_evaluation(args.qrels, args.queries, args.run, args.model, args.scheme,
+                            args.k, args.workers, args.output_dir, args.save_run)
\ No newline at end of file
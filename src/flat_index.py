@@ -0,0 +1,327 @@
+import sys
+import json
+import math
+import heapq
+import bisect
+import struct
+from array import array
+
+"""
+Modul ini berisi representasi indeks "datar" (flat) dalam satu buffer biner.
+Buffer dapat diletakkan di multiprocessing.shared_memory atau file mmap,
+lalu dibaca banyak proses TANPA unpickle/menyalin postings.
+
+Layout buffer (little-endian):
+    [8 byte magic][8 byte panjang metadata][metadata JSON][section ...]
+Section (setiap section disejajarkan 8 byte):
+    term_blob / term_offsets   : term terurut (UTF-8) + offset (uint64)
+    doc_blob / doc_offsets     : doc_id terurut (UTF-8) + offset (uint64)
+    idf                        : float64 per term
+    post_offsets               : uint64 per term (+1), batas postings
+    post_docs                  : uint32 indeks dokumen (terurut naik per term)
+    post_w_<scheme>            : float64 bobot TF-IDF, sejajar dengan post_docs
+    norm_<scheme>              : float64 panjang vektor per dokumen
+    kgram_blob / kgram_offsets : k-gram terurut (UTF-8) + offset (uint64)
+    kgram_post_offsets         : uint64 per k-gram (+1), batas postings k-gram
+    kgram_post_terms           : uint32 term_id (terurut naik per k-gram)
+Postings k-gram ikut disimpan di buffer agar ekspansi wildcard / koreksi typo
+tidak membangun dict k-gram sebesar vocabulary di setiap proses.
+"""
+
+MAGIC = b'EDUKIDX1'
+HEADER = struct.Struct('<8sQ')
+ALIGNMENT = 8
+FORMAT_VERSION = 3 # Naikkan jika layout section berubah (file lama dianggap basi)
+KGRAM_K = 2 # Sama dengan default TermDictionary(k=2)
+
+# --- Builder ---
+
+def _typed(typecode, values):
+    arr = array(typecode, values)
+    if sys.byteorder != 'little':
+        arr.byteswap()
+    return arr
+
+def _blob_with_offsets(strings):
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = [0]
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+    return b''.join(encoded), _typed('Q', offsets)
+
+def build_kgram_postings(terms, k=KGRAM_K):
+    """
+    K-gram index atas term terurut (marker '$' sama dengan TermDictionary._kgrams).
+    :return: Tuple (grams terurut, post_offsets, post_terms)
+    """
+    postings = {}
+    for term_id, term in enumerate(terms):
+        marked = '$' + term + '$'
+        for gram in {marked[i:i + k] for i in range(len(marked) - k + 1)}:
+            postings.setdefault(gram, []).append(term_id)
+
+    grams = sorted(postings)
+    post_offsets, post_terms = [0], []
+    for gram in grams:
+        post_terms.extend(postings[gram])
+        post_offsets.append(len(post_terms))
+    return grams, post_offsets, post_terms
+
+def build_flat_index(inverted_index, idf, tfidf_matrices, doc_norms, metadata=None, doc_ids=None):
+    """
+    Menyusun indeks menjadi satu buffer bytes.
+
+    :param inverted_index: Dict[str, Set[str]] (postings Boolean)
+    :param idf: Dict[str, float]
+    :param tfidf_matrices: Dict[scheme, Dict[doc_id, Dict[term, float]]]
+    :param doc_norms: Dict[scheme, Dict[doc_id, float]]
+    :param metadata: Dict tambahan (versi, statistik, dsb.) yang disimpan di header
+    :param doc_ids: semua doc_id koleksi, termasuk dokumen tanpa token
+                    (None = gabungan postings; dokumen kosong tidak ikut)
+    :return: bytes
+    """
+    terms = sorted(inverted_index.keys())
+    if doc_ids is None:
+        doc_ids = set().union(*inverted_index.values()) if inverted_index else ()
+    doc_ids = sorted(doc_ids)
+    doc_index = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+    schemes = sorted(tfidf_matrices.keys())
+
+    post_offsets = [0]
+    post_docs = []
+    post_weights = {scheme: [] for scheme in schemes}
+    for term in terms:
+        docs = sorted(doc_index[doc_id] for doc_id in inverted_index[term])
+        post_docs.extend(docs)
+        post_offsets.append(len(post_docs))
+        for scheme in schemes:
+            matrix = tfidf_matrices[scheme]
+            post_weights[scheme].extend(matrix.get(doc_ids[d], {}).get(term, 0.0) for d in docs)
+
+    term_blob, term_offsets = _blob_with_offsets(terms)
+    doc_blob, doc_offsets = _blob_with_offsets(doc_ids)
+    sections = [
+        ('term_blob', 'B', term_blob),
+        ('term_offsets', 'Q', term_offsets),
+        ('doc_blob', 'B', doc_blob),
+        ('doc_offsets', 'Q', doc_offsets),
+        ('idf', 'd', _typed('d', (idf.get(term, 0.0) for term in terms))),
+        ('post_offsets', 'Q', _typed('Q', post_offsets)),
+        ('post_docs', 'I', _typed('I', post_docs)),
+    ]
+    for scheme in schemes:
+        sections.append((f'post_w_{scheme}', 'd', _typed('d', post_weights[scheme])))
+        sections.append((f'norm_{scheme}', 'd', _typed('d', (doc_norms[scheme].get(d, 0.0) for d in doc_ids))))
+
+    grams, kgram_post_offsets, kgram_post_terms = build_kgram_postings(terms)
+    kgram_blob, kgram_offsets = _blob_with_offsets(grams)
+    sections += [
+        ('kgram_blob', 'B', kgram_blob),
+        ('kgram_offsets', 'Q', kgram_offsets),
+        ('kgram_post_offsets', 'Q', _typed('Q', kgram_post_offsets)),
+        ('kgram_post_terms', 'I', _typed('I', kgram_post_terms)),
+    ]
+
+    # Offset section dihitung relatif terhadap awal area data
+    layout, cursor = {}, 0
+    for name, typecode, data in sections:
+        size = len(data) * (data.itemsize if isinstance(data, array) else 1)
+        layout[name] = [cursor, size, typecode]
+        cursor += size + (-size % ALIGNMENT)
+
+    meta = dict(metadata or {})
+    meta.update({"format": FORMAT_VERSION, "n_terms": len(terms), "n_docs": len(doc_ids), "schemes": schemes,
+                 "kgram_k": KGRAM_K, "n_kgrams": len(grams), "sections": layout})
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+    meta_bytes += b' ' * (-(HEADER.size + len(meta_bytes)) % ALIGNMENT)
+
+    parts = [HEADER.pack(MAGIC, len(meta_bytes)), meta_bytes]
+    for name, typecode, data in sections:
+        raw = data.tobytes() if isinstance(data, array) else data
+        parts.append(raw)
+        parts.append(b'\0' * (-len(raw) % ALIGNMENT))
+    return b''.join(parts)
+
+# --- Reader (Zero-Copy) ---
+
+class _TermSequence:
+    """Urutan term terurut yang di-decode on-demand (mendukung bisect)."""
+
+    def __init__(self, flat):
+        self._flat = flat
+
+    def __len__(self):
+        return self._flat.n_terms
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._flat.term_at(i)
+
+class _IdfView:
+    """Adapter dict-like {term: idf} untuk vsm_ir.vectorize_query."""
+
+    def __init__(self, flat):
+        self._flat = flat
+
+    def get(self, term, default=0):
+        term_id = self._flat.term_id(term)
+        return self._flat.idf[term_id] if term_id >= 0 else default
+
+class _BooleanView:
+    """Adapter dict-like {term: Set[doc_id]} untuk boolean_ir.execute_boolean_query."""
+
+    def __init__(self, flat):
+        self._flat = flat
+
+    def get(self, term, default=None):
+        term_id = self._flat.term_id(term)
+        if term_id < 0:
+            return set() if default is None else default
+        start, end = self._flat.postings_range(term_id)
+        return {self._flat.doc_id(d) for d in self._flat.post_docs[start:end]}
+
+    def __contains__(self, term):
+        return self._flat.term_id(term) >= 0
+
+class _KgramView:
+    """
+    Adapter dict-like {gram: [term_id, ...]} untuk TermDictionary.
+    Postings dikembalikan sebagai memoryview (tanpa salinan per proses).
+    """
+
+    def __init__(self, flat):
+        self._blob = flat._sections['kgram_blob']
+        self._offsets = flat._sections['kgram_offsets']
+        self._post_offsets = flat._sections['kgram_post_offsets']
+        self._post_terms = flat._sections['kgram_post_terms']
+        self.n_grams = flat.metadata["n_kgrams"]
+
+    def _gram_at(self, i):
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]]).decode('utf-8')
+
+    def get(self, gram, default=None):
+        lo, hi = 0, self.n_grams # Binary search di kgram_blob
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._gram_at(mid) < gram:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n_grams and self._gram_at(lo) == gram:
+            return self._post_terms[self._post_offsets[lo]:self._post_offsets[lo + 1]]
+        return default
+
+class FlatIndex:
+    """
+    Pembaca indeks datar di atas buffer apa pun (bytes, mmap, shared_memory.buf).
+    Semua array adalah memoryview ke buffer asli, bukan salinan.
+    """
+
+    def __init__(self, buffer):
+        self._buffer = memoryview(buffer)
+        magic, meta_len = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Buffer bukan indeks EduKesehatan (magic tidak cocok)")
+        data_start = HEADER.size + meta_len
+        self.metadata = json.loads(bytes(self._buffer[HEADER.size:data_start]).decode('utf-8'))
+        self.n_terms = self.metadata["n_terms"]
+        self.n_docs = self.metadata["n_docs"]
+        self.schemes = self.metadata["schemes"]
+
+        self._sections = {}
+        for name, (offset, size, typecode) in self.metadata["sections"].items():
+            view = self._buffer[data_start + offset:data_start + offset + size]
+            self._sections[name] = view if typecode == 'B' else view.cast(typecode)
+
+        self.term_blob = self._sections['term_blob']
+        self.term_offsets = self._sections['term_offsets']
+        self.doc_blob = self._sections['doc_blob']
+        self.doc_offsets = self._sections['doc_offsets']
+        self.idf = self._sections['idf']
+        self.post_offsets = self._sections['post_offsets']
+        self.post_docs = self._sections['post_docs']
+        self.post_weights = {scheme: self._sections[f'post_w_{scheme}'] for scheme in self.schemes}
+        self.doc_norms = {scheme: self._sections[f'norm_{scheme}'] for scheme in self.schemes}
+
+        self.terms = _TermSequence(self)
+        self.idf_view = _IdfView(self)
+        self.boolean_view = _BooleanView(self)
+        # Indeks format lama tanpa section k-gram: TermDictionary membangunnya sendiri (lazy)
+        self.kgram_k = self.metadata.get("kgram_k", KGRAM_K)
+        self.kgram_view = _KgramView(self) if 'kgram_blob' in self._sections else None
+
+    def release(self):
+        """Melepas semua memoryview (wajib sebelum shared memory/mmap ditutup)."""
+        for view in self._sections.values():
+            view.release()
+        self._sections.clear()
+        self._buffer.release()
+
+    # --- Lookup ---
+
+    def term_at(self, i):
+        return bytes(self.term_blob[self.term_offsets[i]:self.term_offsets[i + 1]]).decode('utf-8')
+
+    def term_id(self, term):
+        """Binary search term di term_blob. :return: int (-1 jika tidak ada)"""
+        i = bisect.bisect_left(self.terms, term)
+        return i if i < self.n_terms and self.term_at(i) == term else -1
+
+    def doc_id(self, i):
+        # Di-decode on-demand tanpa cache: heap per proses tidak tumbuh seiring jumlah dokumen
+        return bytes(self.doc_blob[self.doc_offsets[i]:self.doc_offsets[i + 1]]).decode('utf-8')
+
+    def postings_range(self, term_id):
+        return self.post_offsets[term_id], self.post_offsets[term_id + 1]
+
+    def contains(self, term_id, doc_idx):
+        """Apakah dokumen doc_idx ada di postings term_id (bisect, postings terurut)."""
+        start, end = self.postings_range(term_id)
+        i = bisect.bisect_left(self.post_docs, doc_idx, start, end)
+        return i < end and self.post_docs[i] == doc_idx
+
+    # --- Scoring ---
+
+    def rank(self, query_vector, k, scheme='sublinear_tf'):
+        """
+        Cosine similarity term-at-a-time langsung di atas buffer.
+        :param query_vector: Dict[str, float] dari vsm_ir.vectorize_query
+        :return: List[Tuple[int, float]] -> [(doc_idx, skor), ...]
+        """
+        weights = self.post_weights[scheme]
+        norms = self.doc_norms[scheme]
+        query_magnitude = math.sqrt(sum(w**2 for w in query_vector.values()))
+        if query_magnitude == 0:
+            return []
+
+        acc = {}
+        for term, q_weight in query_vector.items():
+            term_id = self.term_id(term)
+            if term_id < 0:
+                continue
+            start, end = self.postings_range(term_id)
+            for doc_idx, d_weight in zip(self.post_docs[start:end], weights[start:end]):
+                if d_weight > 0:
+                    acc[doc_idx] = acc.get(doc_idx, 0.0) + q_weight * d_weight
+
+        rankings = [
+            (doc_idx, dot_product / (norms[doc_idx] * query_magnitude))
+            for doc_idx, dot_product in acc.items() if dot_product > 0 and norms[doc_idx] > 0
+        ]
+        return heapq.nlargest(k, rankings, key=lambda item: item[1])
+
+    def explain(self, doc_idx, query_terms, max_terms=5):
+        """Istilah query yang muncul di dokumen (sama seperti search.explain_matches)."""
+        matching_terms = []
+        for term in query_terms:
+            term_id = self.term_id(term)
+            if term_id >= 0 and self.contains(term_id, doc_idx):
+                matching_terms.append(term)
+                if len(matching_terms) >= max_terms:
+                    break
+        return matching_terms
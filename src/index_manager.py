@@ -0,0 +1,187 @@
+import time
+import threading
+import traceback
+import contextlib
+
+"""
+Modul ini berisi pengelola versi indeks untuk hot reload tanpa downtime.
+Termasuk:
+1. IndexSnapshot: satu versi indeks yang tidak pernah diubah setelah dibuat
+2. IndexManager: memuat snapshot, memantau versi baru, lalu menukar (swap)
+   referensi snapshot secara atomik
+Query mengambil snapshot SEKALI di awal (with manager.acquire()) dan memakainya
+sampai selesai, sehingga query yang sedang berjalan tetap selesai di
+snapshot lama walau snapshot baru sudah dipasang. Snapshot lama ditutup
+(mmap & file indeks bersama dilepas) setelah pembaca terakhirnya selesai.
+"""
+
+class IndexSnapshot:
+    """
+    Satu versi indeks (read-only). Mode in-memory mengisi dict indeks;
+    mode indeks bersama (mmap) mengisi shared_index dan view dict-like.
+    """
+
+    def __init__(self, inverted_index, idf, term_dict, all_doc_ids,
+                 docs_tokens=None, tfidf_matrices=None, vsm_postings=None, doc_norms=None,
+                 shared_index=None, duplicates=None, statistics=None, document_statistics=None,
+                 version=None):
+        self.version = version # Diisi IndexManager saat snapshot dipasang
+        self.inverted_index = inverted_index
+        self.idf = idf
+        self.term_dict = term_dict
+        self.all_doc_ids = all_doc_ids
+        self.docs_tokens = docs_tokens
+        self.tfidf_matrices = tfidf_matrices or {}
+        self.vsm_postings = vsm_postings or {}
+        self.doc_norms = doc_norms or {}
+        self.shared_index = shared_index
+        self.duplicates = duplicates or {} # {doc_representatif: [doc_duplikat, ...]}
+        self.statistics = statistics or {} # Ringkasan koleksi dari lintasan indexing
+        self.document_statistics = document_statistics or {} # Panjang & top-N token per dokumen
+        self.lsa_models = {} # {(skema, dimensi): LsaModel} (dibangun loader jika EDUKES_LSA aktif, selain itu lazy)
+        self.loaded_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.readers = 0      # Jumlah query yang sedang memakai snapshot ini (dijaga IndexManager)
+        self.retired = False  # True setelah diganti snapshot baru
+        self.closed = False
+
+    def close(self):
+        """Melepas sumber daya eksternal (mmap + file indeks bersama). Idempoten."""
+        if self.closed:
+            return
+        self.closed = True
+        if self.shared_index is not None:
+            self.shared_index.close()
+
+class IndexManager:
+    """
+    Pemegang snapshot indeks aktif.
+
+    :param loader: fungsi () -> IndexSnapshot (boleh lambat, dijalankan di background)
+    :param version_fn: fungsi () -> versi saat ini (murah, dipanggil tiap polling)
+    :param on_swap: callback opsional (snapshot_baru) setelah swap
+
+    Contoh:
+        manager = IndexManager(build_snapshot, snapshot_version)
+        manager.load()
+        manager.start_watching(poll_interval_s=5.0)
+        with manager.acquire() as snapshot:
+            ...
+    """
+
+    def __init__(self, loader, version_fn, on_swap=None):
+        self.loader = loader
+        self.version_fn = version_fn
+        self.on_swap = on_swap
+        self.reloads = 0
+        self.last_error = None
+        self._snapshot = None
+        self._reload_lock = threading.Lock() # Hanya satu build dalam satu waktu
+        self._ref_lock = threading.Lock()    # Menjaga swap & hitungan pembaca snapshot
+        self._stop_event = threading.Event()
+        self._watcher = None
+
+    def current(self):
+        """
+        Snapshot aktif (baca referensi atomik, tanpa lock & tanpa pin).
+        Cukup untuk metadata; query yang membaca indeks memakai acquire().
+        """
+        return self._snapshot
+
+    @contextlib.contextmanager
+    def acquire(self):
+        """
+        Pin snapshot aktif selama blok with berjalan. Snapshot yang sudah
+        diganti baru ditutup setelah pin terakhirnya dilepas.
+        """
+        with self._ref_lock:
+            snapshot = self._snapshot
+            snapshot.readers += 1
+        try:
+            yield snapshot
+        finally:
+            with self._ref_lock:
+                snapshot.readers -= 1
+                drained = snapshot.retired and snapshot.readers == 0
+            if drained:
+                self._close(snapshot)
+
+    def _close(self, snapshot):
+        try:
+            snapshot.close()
+        except Exception as e: # Gagal menutup snapshot lama tidak boleh menggagalkan query
+            self.last_error = repr(e)
+            traceback.print_exc()
+
+    def load(self):
+        """Muat snapshot pertama secara sinkron (saat startup)."""
+        self.reload(force=True)
+        return self._snapshot
+
+    def reload(self, force=False):
+        """
+        Bangun snapshot baru jika versi berubah, lalu swap.
+        Jika build gagal, snapshot lama tetap dipakai (error disimpan di last_error).
+        :return: True jika snapshot ditukar
+        """
+        with self._reload_lock:
+            # Versi dicatat SEBELUM build: perubahan selama build terdeteksi di polling berikutnya
+            version = self.version_fn()
+            if not force and self._snapshot is not None and version == self._snapshot.version:
+                return False
+            snapshot = self.loader()
+            snapshot.version = version
+            with self._ref_lock:
+                old = self._snapshot
+                self._snapshot = snapshot # Swap atomik: query baru langsung memakai versi ini
+                drained = False
+                if old is not None:
+                    old.retired = True
+                    drained = old.readers == 0
+            self.reloads += 1
+            self.last_error = None
+        if self.on_swap is not None:
+            self.on_swap(snapshot)
+        if drained: # Tanpa pembaca aktif: langsung ditutup; jika ada, pembaca terakhir yang menutup
+            self._close(old)
+        return True
+
+    # --- Watcher (Background) ---
+
+    def start_watching(self, poll_interval_s=5.0):
+        """Mulai thread daemon yang memantau versi indeks (idempoten)."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return self._watcher
+        self._stop_event.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(poll_interval_s,), name='edukes-index-watcher', daemon=True,
+        )
+        self._watcher.start()
+        return self._watcher
+
+    def stop_watching(self, timeout=None):
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout)
+            self._watcher = None
+
+    def _watch(self, poll_interval_s):
+        while not self._stop_event.wait(poll_interval_s):
+            try:
+                if self.reload():
+                    print(f"Indeks dimuat ulang (versi {self._snapshot.version[:12]}).")
+            except Exception as e: # Watcher tidak boleh mati karena satu build gagal
+                self.last_error = repr(e)
+                traceback.print_exc()
+
+    def status(self):
+        """Ringkasan status untuk health check / panel debug."""
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot is not None else None,
+            "loaded_at": snapshot.loaded_at if snapshot is not None else None,
+            "documents": len(snapshot.all_doc_ids) if snapshot is not None else 0,
+            "collection": snapshot.statistics if snapshot is not None else {},
+            "reloads": self.reloads,
+            "watching": self._watcher is not None and self._watcher.is_alive(),
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,185 @@
+import sys
+import os
+import mmap
+import time
+import hashlib
+import argparse
+
+# Menambahkan path agar bisa impor modul dari root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src import preprocess, boolean_ir, vsm_ir, term_index, flat_index, dedup, collection_stats
+
+"""
+Modul ini berisi penyimpanan indeks bersama (shared, read-only) berbasis file mmap.
+Termasuk:
+1. build_index_bytes_from_dir: membangun flat index dari data/processed
+2. publish_index: menulis file indeks secara atomik (tmp + os.replace)
+3. attach_index / MappedIndex: memetakan file ke memori (mmap, read-only)
+4. FlatSearcher: pencarian VSM & Boolean langsung di atas flat index
+Semua proses (replika Streamlit, CLI, worker) yang meng-attach file yang sama
+berbagi halaman page cache OS yang sama, sehingga total RSS tidak tumbuh
+sebanding jumlah proses.
+"""
+
+SCRIPT_DIR = os.path.dirname(__file__)
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
+DEFAULT_DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed')
+DEFAULT_INDEX_PATH = os.path.join(PROJECT_ROOT, 'data', 'index', 'edukes.idx')
+
+# --- Build & Publish ---
+
+def source_signature(doc_dir=DEFAULT_DATA_PATH):
+    """Sidik jari korpus (nama, ukuran, mtime file .txt) untuk mendeteksi indeks basi."""
+    digest = hashlib.sha1()
+    for filename in sorted(os.listdir(doc_dir)):
+        if filename.endswith('.txt'):
+            stat = os.stat(os.path.join(doc_dir, filename))
+            digest.update(f"{filename}:{stat.st_size}:{stat.st_mtime_ns};".encode('utf-8'))
+    return digest.hexdigest()
+
+def build_index_bytes_from_dir(doc_dir=DEFAULT_DATA_PATH, dedup_threshold=None):
+    """
+    Membangun flat index (bytes) dari dokumen terproses, sama seperti search.build_snapshot.
+    Jika dedup_threshold diisi, near-duplicate digabung dan klasternya disimpan di metadata.
+    """
+    signature = source_signature(doc_dir)
+    processed_docs = preprocess.load_documents(doc_dir)
+    docs_tokens = {doc_id: preprocess.tokenize(text) for doc_id, text in processed_docs.items()}
+    duplicates = {}
+    if dedup_threshold is not None:
+        duplicates = dedup.find_near_duplicates(docs_tokens, dedup_threshold)
+        docs_tokens = dedup.collapse_duplicates(docs_tokens, duplicates)
+
+    stats = collection_stats.collect_index_statistics(docs_tokens) # Satu lintasan: postings, TF, DF, CF, top-N
+    inverted_index = stats.postings
+    tf = stats.tf
+    idf = vsm_ir.calculate_idf(stats.df, stats.n_docs)
+
+    tfidf_matrices, doc_norms = {}, {}
+    for scheme in ('sublinear_tf', 'raw_tf'):
+        tfidf_matrices[scheme] = vsm_ir.build_tfidf_matrix(tf, idf, scheme=scheme)
+        doc_norms[scheme] = vsm_ir.calculate_doc_norms(tfidf_matrices[scheme])
+
+    metadata = {
+        "source_signature": signature,
+        "built_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "dedup_threshold": dedup_threshold,
+        "duplicates": duplicates,
+        "statistics": stats.summary(),
+        "document_statistics": stats.document_statistics(),
+    }
+    return flat_index.build_flat_index(inverted_index, idf, tfidf_matrices, doc_norms, metadata,
+                                       doc_ids=docs_tokens.keys())
+
+def publish_index(index_bytes, path=DEFAULT_INDEX_PATH):
+    """
+    Menulis file indeks secara atomik. Proses yang masih memetakan versi
+    lama tetap aman: os.replace tidak mengubah isi file lama yang sudah di-mmap.
+    """
+    parent = os.path.dirname(path)
+    if parent and not os.path.exists(parent):
+        os.makedirs(parent, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(index_bytes)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return path
+
+# --- Pencarian di atas Flat Index ---
+
+class FlatSearcher:
+    """Pencarian VSM & Boolean di atas FlatIndex (bentuk hasil sama dengan src.search)."""
+
+    def __init__(self, flat):
+        self.flat = flat
+        self.term_dict = term_index.TermDictionary(flat.terms, k=flat.kgram_k, presorted=True,
+                                                   kgram_index=flat.kgram_view)
+
+    def search_vsm(self, query_str, k, scheme='sublinear_tf'):
+        query_tokens = term_index.expand_query_tokens(query_str, self.term_dict)
+        return self.score_vsm(query_tokens, k, scheme)
+
+    def score_vsm(self, query_tokens, k, scheme='sublinear_tf'):
+        query_vector = vsm_ir.vectorize_query(query_tokens, self.flat.idf_view, scheme=scheme)
+        query_terms = list(dict.fromkeys(query_tokens))
+        return [
+            (self.flat.doc_id(doc_idx), score, self.flat.explain(doc_idx, query_terms))
+            for doc_idx, score in self.flat.rank(query_vector, k, scheme)
+        ]
+
+    def search_boolean(self, query_str):
+        query_tokens = boolean_ir.preprocess_boolean_query(query_str, term_dict=self.term_dict)
+        doc_ids = boolean_ir.execute_boolean_query(query_tokens, self.flat.boolean_view, term_dict=self.term_dict)
+        return [(doc_id, 1.0, []) for doc_id in doc_ids]
+
+    def doc_ids(self):
+        return [self.flat.doc_id(i) for i in range(self.flat.n_docs)]
+
+# --- Attach (mmap) ---
+
+class MappedIndex(FlatSearcher):
+    """Flat index yang dipetakan dari file (read-only, dibagi antar proses)."""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        super().__init__(flat_index.FlatIndex(self._mmap))
+        self.metadata = self.flat.metadata
+        self.size = len(self._mmap)
+
+    def to_bytes(self):
+        """Salinan isi yang dipetakan (file di path bisa sudah diganti versi baru)."""
+        return self._mmap[:]
+
+    def close(self):
+        self.flat.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+def attach_index(path=DEFAULT_INDEX_PATH):
+    return MappedIndex(path)
+
+def load_or_publish(doc_dir=DEFAULT_DATA_PATH, path=DEFAULT_INDEX_PATH, dedup_threshold=None):
+    """
+    Attach ke file indeks jika masih sesuai dengan korpus, pengaturan dedup, dan format;
+    jika belum ada atau basi, bangun sekali, publikasikan, lalu attach.
+    """
+    signature = source_signature(doc_dir)
+    if os.path.exists(path):
+        mapped = attach_index(path)
+        if (mapped.metadata.get("source_signature") == signature
+                and mapped.metadata.get("dedup_threshold") == dedup_threshold
+                and mapped.metadata.get("format") == flat_index.FORMAT_VERSION):
+            return mapped
+        mapped.close()
+        print(f"Indeks bersama di {path} sudah basi, membangun ulang...")
+
+    print(f"Membangun indeks bersama dari {doc_dir}...")
+    publish_index(build_index_bytes_from_dir(doc_dir, dedup_threshold), path)
+    return attach_index(path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Publikasikan indeks bersama (mmap) untuk semua proses.")
+    parser.add_argument('--doc-dir', default=DEFAULT_DATA_PATH, help="Folder dokumen terproses.")
+    parser.add_argument('--path', default=DEFAULT_INDEX_PATH, help="Lokasi file indeks.")
+    parser.add_argument('--force', action='store_true', help="Bangun ulang walau indeks masih sesuai.")
+    parser.add_argument('--dedup', type=float, default=dedup.threshold_from_env(),
+                        help="Gabungkan near-duplicate dengan threshold Jaccard ini (default: env EDUKES_DEDUP).")
+    args = parser.parse_args()
+
+    if args.force:
+        publish_index(build_index_bytes_from_dir(args.doc_dir, args.dedup), args.path)
+    with load_or_publish(args.doc_dir, args.path, args.dedup) as mapped:
+        print(f"Indeks bersama siap: {args.path} ({mapped.size / 1024:.1f} KB, "
+              f"{mapped.flat.n_docs} dokumen, {mapped.flat.n_terms} term)")
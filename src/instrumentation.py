@@ -0,0 +1,172 @@
+import json
+import time
+import bisect
+import contextvars
+from contextlib import contextmanager
+
+"""
+Modul ini berisi lapisan instrumentasi ringan untuk pipeline pencarian.
+Termasuk:
+1. Timer bersarang (misal "search_vsm/rank_documents")
+2. Counter (postings dipindai, dokumen diskor, cache hit, ...)
+3. Histogram dengan bucket tetap
+4. Ekspor ke JSON atau format teks Prometheus
+Instrumentasi hanya aktif di dalam blok `with profile():` (per request,
+via contextvars). Di luar blok itu semua hook adalah no-op murah.
+"""
+
+# Bucket default histogram (milidetik) dan bucket untuk nilai hitungan
+DEFAULT_BUCKETS_MS = (0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+_ACTIVE_PROFILER = contextvars.ContextVar('edukes_profiler', default=None)
+
+# --- Profiler ---
+
+class Histogram:
+    """Histogram kumulatif sederhana (gaya Prometheus)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1) # +1 untuk +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def to_dict(self):
+        cumulative, running = {}, 0
+        for bound, bucket_count in zip(self.buckets + ('+Inf',), self.bucket_counts):
+            running += bucket_count
+            cumulative[str(bound)] = running
+        return {"count": self.count, "sum": round(self.total, 6), "buckets": cumulative}
+
+class Profiler:
+    """Pengumpul timer, counter, dan histogram untuk satu request."""
+
+    def __init__(self):
+        self.timers = {}     # {path: {"count", "total_ms", "max_ms"}}
+        self.counters = {}   # {name: int}
+        self.histograms = {} # {name: Histogram}
+        self._stack = []
+
+    @contextmanager
+    def timer(self, name):
+        """Timer bersarang: nama disusun dari timer induk, misal 'search_vsm/explain'."""
+        self._stack.append(name)
+        path = '/'.join(self._stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._stack.pop()
+            stats = self.timers.get(path)
+            if stats is None:
+                stats = self.timers[path] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS_MS):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram(buckets)
+        histogram.observe(value)
+
+    # --- Ekspor ---
+
+    def to_dict(self):
+        return {
+            "timers": {
+                path: {key: round(value, 6) if isinstance(value, float) else value for key, value in stats.items()}
+                for path, stats in self.timers.items()
+            },
+            "counters": dict(self.counters),
+            "histograms": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self, prefix='edukes'):
+        """Format eksposisi teks Prometheus."""
+        lines = []
+        if self.timers:
+            lines.append(f"# TYPE {prefix}_stage_milliseconds_total counter")
+            for path, stats in self.timers.items():
+                lines.append(f'{prefix}_stage_milliseconds_total{{stage="{path}"}} {stats["total_ms"]:.6f}')
+            lines.append(f"# TYPE {prefix}_stage_calls_total counter")
+            for path, stats in self.timers.items():
+                lines.append(f'{prefix}_stage_calls_total{{stage="{path}"}} {stats["count"]}')
+        for name, value in self.counters.items():
+            metric = f"{prefix}_{_metric_name(name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        for name, histogram in self.histograms.items():
+            metric = f"{prefix}_{_metric_name(name)}"
+            lines.append(f"# TYPE {metric} histogram")
+            for bound, cumulative in histogram.to_dict()["buckets"].items():
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"{metric}_sum {histogram.total:.6f}")
+            lines.append(f"{metric}_count {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+def _metric_name(name):
+    """Nama metrik Prometheus hanya boleh [a-zA-Z0-9_]."""
+    return ''.join(char if char.isalnum() else '_' for char in name)
+
+# --- Hook Global (No-op Jika Tidak Aktif) ---
+
+class _NullTimer:
+    """Context manager kosong yang dipakai ulang saat profiling nonaktif."""
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+@contextmanager
+def profile(profiler=None):
+    """
+    Mengaktifkan profiling untuk blok kode (dan fungsi yang dipanggilnya).
+
+    Contoh:
+        with instrumentation.profile() as prof:
+            search.search_vsm("gula darah", 5)
+        print(prof.to_json())
+    """
+    profiler = profiler or Profiler()
+    token = _ACTIVE_PROFILER.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _ACTIVE_PROFILER.reset(token)
+
+def current():
+    """Profiler aktif, atau None jika profiling nonaktif."""
+    return _ACTIVE_PROFILER.get()
+
+def enabled():
+    return _ACTIVE_PROFILER.get() is not None
+
+def timer(name):
+    profiler = _ACTIVE_PROFILER.get()
+    return _NULL_TIMER if profiler is None else profiler.timer(name)
+
+def count(name, value=1):
+    profiler = _ACTIVE_PROFILER.get()
+    if profiler is not None:
+        profiler.count(name, value)
+
+def observe(name, value, buckets=DEFAULT_BUCKETS_MS):
+    profiler = _ACTIVE_PROFILER.get()
+    if profiler is not None:
+        profiler.observe(name, value, buckets)
@@ -0,0 +1,217 @@
+import numpy as np
+
+from src import instrumentation
+
+"""
+Modul ini berisi Latent Semantic Analysis (LSA / LSI) di atas matriks TF-IDF.
+Termasuk:
+1. Konversi TF-IDF (dict atau flat index) ke matriks sparse sederhana (NumPy)
+2. Randomized truncated SVD (Halko dkk.) tanpa dependensi selain NumPy
+3. LsaModel: vektor dokumen float32 berdimensi tetap + folding query
+4. Ranking dengan satu perkalian matriks-vektor, opsional per blok (top-k bertahap)
+Dokumen dan query diproyeksikan ke ruang laten yang sama (x -> x @ V_k), sehingga
+istilah yang sering muncul bersama (misal "gula darah" & "diabetes") saling mendekat.
+"""
+
+DEFAULT_COMPONENTS = 100
+DEFAULT_OVERSAMPLES = 10
+DEFAULT_POWER_ITERATIONS = 2
+SCORE_EPSILON = 1e-6 # Skor di bawah ini dianggap nol (sisa pembulatan float32), bukan hit
+
+# --- Matriks Sparse (Dokumen x Term) ---
+
+CHUNK_ELEMENTS = 1 << 23 # Batas ukuran array sementara per potongan perkalian (~64 MB float64)
+
+def _compress(major, minor, data, n_major):
+    """COO -> (indptr, indices, data) terurut menurut sumbu major."""
+    order = np.argsort(major, kind='stable')
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(major, minlength=n_major))))
+    return indptr, minor[order], data[order]
+
+def _compressed_matmul(indptr, indices, data, dense):
+    """Perkalian matriks terkompresi x matriks padat, diproses per potongan baris."""
+    n_rows = len(indptr) - 1
+    out = np.zeros((n_rows, dense.shape[1]))
+    chunk_nnz = max(1, CHUNK_ELEMENTS // max(1, dense.shape[1]))
+    row = 0
+    while row < n_rows:
+        end = int(np.searchsorted(indptr, indptr[row] + chunk_nnz, side='right')) - 1
+        end = min(max(end, row + 1), n_rows)
+        lo, hi = indptr[row], indptr[end]
+        if hi > lo:
+            products = data[lo:hi, None] * dense[indices[lo:hi]]
+            starts = indptr[row:end] - lo
+            nonempty = indptr[row + 1:end + 1] > indptr[row:end]
+            out[row:end][nonempty] = np.add.reduceat(products, starts[nonempty], axis=0)
+        row = end
+    return out
+
+class SparseMatrix:
+    """
+    Matriks sparse minimal (baris = dokumen, kolom = term), disimpan dua kali:
+    terkompresi per baris (untuk A @ X) dan per kolom (untuk A.T @ X).
+    """
+
+    def __init__(self, rows, cols, data, shape):
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        data = np.asarray(data, dtype=np.float64)
+        self.shape = shape
+        self.nnz = len(data)
+        self._by_row = _compress(rows, cols, data, shape[0])
+        self._by_col = _compress(cols, rows, data, shape[1])
+
+    def dot(self, dense):
+        """A @ dense -> (n_docs x l)"""
+        return _compressed_matmul(*self._by_row, dense)
+
+    def tdot(self, dense):
+        """A.T @ dense -> (n_terms x l)"""
+        return _compressed_matmul(*self._by_col, dense)
+
+def matrix_from_tfidf(tfidf_matrix):
+    """
+    :param tfidf_matrix: Dict[doc_id, Dict[term, float]] dari vsm_ir.build_tfidf_matrix
+    :return: (SparseMatrix, doc_ids, terms)
+    """
+    doc_ids = sorted(tfidf_matrix.keys())
+    terms = sorted({term for doc_vector in tfidf_matrix.values() for term in doc_vector})
+    term_ids = {term: i for i, term in enumerate(terms)}
+    rows, cols, data = [], [], []
+    for doc_idx, doc_id in enumerate(doc_ids):
+        for term, weight in tfidf_matrix[doc_id].items():
+            if weight != 0:
+                rows.append(doc_idx)
+                cols.append(term_ids[term])
+                data.append(weight)
+    return SparseMatrix(rows, cols, data, (len(doc_ids), len(terms))), doc_ids, terms
+
+def matrix_from_flat_index(flat, scheme='sublinear_tf'):
+    """
+    Sama seperti matrix_from_tfidf, tetapi langsung dari postings flat_index
+    (mode indeks bersama) tanpa membangun dict TF-IDF.
+    :return: (SparseMatrix, doc_ids, terms)
+    """
+    post_offsets = np.frombuffer(flat.post_offsets, dtype=np.uint64).astype(np.int64)
+    rows = np.frombuffer(flat.post_docs, dtype=np.uint32).astype(np.int64)
+    data = np.frombuffer(flat.post_weights[scheme], dtype=np.float64)
+    cols = np.repeat(np.arange(flat.n_terms, dtype=np.int64), np.diff(post_offsets))
+    nonzero = data != 0
+    doc_ids = [flat.doc_id(i) for i in range(flat.n_docs)]
+    terms = list(flat.terms)
+    return SparseMatrix(rows[nonzero], cols[nonzero], data[nonzero], (flat.n_docs, flat.n_terms)), doc_ids, terms
+
+# --- Randomized Truncated SVD ---
+
+def randomized_svd(matrix, n_components, n_oversamples=DEFAULT_OVERSAMPLES,
+                   n_power_iterations=DEFAULT_POWER_ITERATIONS, seed=42):
+    """
+    SVD terpotong acak: A ~= U_k S_k V_k^T.
+    Range A dicari lewat proyeksi acak (+ power iteration untuk spektrum yang
+    meluruh lambat), lalu SVD eksak dikerjakan pada matriks kecil (l x n_terms).
+
+    :param matrix: SparseMatrix (n_docs x n_terms)
+    :return: (U [n_docs x k], S [k], Vt [k x n_terms])
+    """
+    n_docs, n_terms = matrix.shape
+    n_random = min(n_components + n_oversamples, n_docs, n_terms)
+    rng = np.random.default_rng(seed)
+
+    Q = matrix.dot(rng.standard_normal((n_terms, n_random)))
+    Q, _ = np.linalg.qr(Q)
+    for _ in range(n_power_iterations):
+        # Re-ortogonalisasi di setiap langkah menjaga kestabilan numerik
+        Z, _ = np.linalg.qr(matrix.tdot(Q))
+        Q, _ = np.linalg.qr(matrix.dot(Z))
+
+    B = matrix.tdot(Q).T # (l x n_terms) = Q^T A
+    U_small, S, Vt = np.linalg.svd(B, full_matrices=False)
+    U = Q @ U_small
+    k = min(n_components, len(S))
+    return U[:, :k], S[:k], Vt[:k]
+
+# --- Model ---
+
+class LsaModel:
+    """
+    Model LSA: vektor dokumen float32 (ternormalisasi L2) + proyeksi term.
+
+    :param doc_ids: List[str] sesuai baris doc_vectors
+    :param terms: List[str] sesuai baris term_vectors
+    :param term_vectors: np.ndarray float32 (n_terms x k), yaitu V_k
+    :param doc_vectors: np.ndarray float32 (n_docs x k), yaitu U_k S_k ternormalisasi
+    """
+
+    def __init__(self, doc_ids, terms, term_vectors, doc_vectors, singular_values):
+        self.doc_ids = doc_ids
+        self.terms = terms
+        self.term_ids = {term: i for i, term in enumerate(terms)}
+        self.term_vectors = term_vectors
+        self.doc_vectors = doc_vectors
+        self.singular_values = singular_values
+
+    @property
+    def n_components(self):
+        return self.doc_vectors.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.doc_vectors.nbytes + self.term_vectors.nbytes
+
+    def project_query(self, query_vector):
+        """
+        Folding-in query: q_k = q @ V_k (ternormalisasi).
+        :param query_vector: Dict[str, float] dari vsm_ir.vectorize_query
+        :return: np.ndarray float32 (k,) atau None jika tidak ada term yang dikenal
+        """
+        projected = np.zeros(self.n_components, dtype=np.float32)
+        for term, weight in query_vector.items():
+            term_id = self.term_ids.get(term)
+            if term_id is not None:
+                projected += weight * self.term_vectors[term_id]
+        norm = np.linalg.norm(projected)
+        return projected / norm if norm > 0 else None
+
+    def rank(self, query_vector, k, block_size=None):
+        """
+        Cosine similarity di ruang laten. Tanpa block_size: satu matvec untuk
+        semua dokumen. Dengan block_size: dokumen diskor per blok dan hanya
+        top-k sementara yang disimpan (memori skor tetap kecil untuk korpus besar).
+
+        :return: List[Tuple[str, float]] -> [(doc_id, skor), ...] (skor > SCORE_EPSILON)
+        """
+        projected = self.project_query(query_vector)
+        if projected is None or k <= 0:
+            return []
+        instrumentation.count('documents_scored', len(self.doc_ids))
+
+        n_docs = len(self.doc_ids)
+        block_size = block_size or n_docs
+        best_idx = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, n_docs, block_size):
+            scores = self.doc_vectors[start:start + block_size] @ projected
+            idx = np.arange(start, start + len(scores))
+            best_idx = np.concatenate((best_idx, idx))
+            best_scores = np.concatenate((best_scores, scores))
+            if len(best_scores) > k:
+                keep = np.argpartition(-best_scores, k - 1)[:k]
+                best_idx, best_scores = best_idx[keep], best_scores[keep]
+
+        order = np.argsort(-best_scores, kind='stable')
+        return [
+            (self.doc_ids[best_idx[i]], float(best_scores[i]))
+            for i in order if best_scores[i] > SCORE_EPSILON
+        ]
+
+def build_lsa_model(matrix, doc_ids, terms, n_components=DEFAULT_COMPONENTS, seed=42):
+    """
+    Faktorisasi matriks TF-IDF dan simpan vektor dokumen float32.
+    :param matrix: SparseMatrix dari matrix_from_tfidf / matrix_from_flat_index
+    :return: LsaModel
+    """
+    U, S, Vt = randomized_svd(matrix, n_components, seed=seed)
+    doc_vectors = (U * S).astype(np.float32)
+    norms = np.linalg.norm(doc_vectors, axis=1, keepdims=True)
+    doc_vectors /= np.where(norms > 0, norms, 1.0)
+    return LsaModel(doc_ids, terms, np.ascontiguousarray(Vt.T, dtype=np.float32), doc_vectors, S)
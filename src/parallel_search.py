@@ -0,0 +1,161 @@
+import sys
+import os
+import time
+import argparse
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+# Menambahkan path agar bisa impor modul dari root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+# Sengaja TIDAK mengimpor src.search di level modul: worker (spawn) mengimpor
+# modul ini, dan src.search akan membangun ulang seluruh indeks di setiap worker.
+from src import preprocess, flat_index, index_store
+
+"""
+Searcher facade berbasis process pool untuk melewati batasan GIL.
+- Proses induk menyusun snapshot indeks read-only (flat_index) satu kali
+  dan menaruhnya di multiprocessing.shared_memory.
+- Setiap worker meng-attach segmen yang sama (tanpa pickle/salinan postings),
+  lalu menjalankan preprocessing (Sastrawi) dan scoring secara mandiri.
+- Worker dipanaskan saat startup (stemmer & import sudah siap).
+"""
+
+# State per proses worker (diisi oleh _init_worker)
+_WORKER = {}
+
+# --- Fungsi Worker ---
+
+def _init_worker(shm_name):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _WORKER['shm'] = shm
+    _WORKER['searcher'] = index_store.FlatSearcher(flat_index.FlatIndex(shm.buf))
+    preprocess.preprocess_document("pemanasan stemmer") # Pre-warm Sastrawi
+
+def _worker_ping(delay_s):
+    time.sleep(delay_s)
+    return os.getpid()
+
+def _worker_search_vsm(query_str, k, scheme):
+    return _WORKER['searcher'].search_vsm(query_str, k, scheme)
+
+def _worker_search_vsm_chunk(queries, k, scheme):
+    return [_WORKER['searcher'].search_vsm(query_str, k, scheme) for query_str in queries]
+
+def _worker_search_boolean(query_str):
+    return _WORKER['searcher'].search_boolean(query_str)
+
+# --- Snapshot ---
+
+def build_index_bytes():
+    """Menyusun snapshot flat index dari snapshot indeks aktif src.search."""
+    from src import search
+    with search.MANAGER.acquire() as snapshot: # Pin: hot reload tidak menutup snapshot saat diserialisasi
+        if snapshot.shared_index is not None: # Sudah berupa flat index yang di-mmap
+            return snapshot.shared_index.to_bytes()
+        return flat_index.build_flat_index(
+            snapshot.inverted_index,
+            snapshot.idf,
+            snapshot.tfidf_matrices,
+            snapshot.doc_norms,
+            doc_ids=snapshot.all_doc_ids,
+        )
+
+# --- Facade ---
+
+class ParallelSearcher:
+    """
+    Facade pencarian di atas process pool + shared memory.
+
+    Contoh:
+        with ParallelSearcher(workers=4) as searcher:
+            searcher.search_vsm("gula darah", 5)
+            searcher.search_vsm_many(queries, 10)
+    """
+
+    def __init__(self, index_bytes=None, workers=None, mp_context='spawn'):
+        if index_bytes is None:
+            index_bytes = build_index_bytes()
+        self.index_size = len(index_bytes)
+        self._shm = shared_memory.SharedMemory(create=True, size=self.index_size)
+        self._shm.buf[:self.index_size] = index_bytes
+        del index_bytes
+
+        # 'spawn' dipakai di semua OS: worker tidak mewarisi dict indeks induk
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(mp_context),
+            initializer=_init_worker,
+            initargs=(self._shm.name,),
+        )
+        self._warm_up()
+
+    def _warm_up(self, max_rounds=5):
+        """Memastikan semua worker sudah hidup & terinisialisasi sebelum melayani query."""
+        pids = set()
+        for _ in range(max_rounds):
+            futures = [self._pool.submit(_worker_ping, 0.05) for _ in range(self.workers)]
+            pids.update(future.result() for future in futures)
+            if len(pids) >= self.workers:
+                break
+        return pids
+
+    # --- API Pencarian (bentuk hasil sama dengan src.search) ---
+
+    def submit_vsm(self, query_str, k, scheme='sublinear_tf'):
+        return self._pool.submit(_worker_search_vsm, query_str, k, scheme)
+
+    def submit_boolean(self, query_str):
+        return self._pool.submit(_worker_search_boolean, query_str)
+
+    def search_vsm(self, query_str, k, scheme='sublinear_tf'):
+        return self.submit_vsm(query_str, k, scheme).result()
+
+    def search_boolean(self, query_str):
+        return self.submit_boolean(query_str).result()
+
+    def search_vsm_many(self, queries, k, scheme='sublinear_tf', chunk_size=None):
+        """Banyak query sekaligus; dibagi per chunk agar overhead IPC kecil."""
+        queries = list(queries)
+        chunk_size = chunk_size or max(1, len(queries) // (self.workers * 4))
+        chunks = [queries[i:i + chunk_size] for i in range(0, len(queries), chunk_size)]
+        futures = [self._pool.submit(_worker_search_vsm_chunk, chunk, k, scheme) for chunk in chunks]
+        return [result for future in futures for result in future.result()]
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Uji throughput ParallelSearcher (process pool + shared memory).")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Jumlah worker maksimum.")
+    parser.add_argument('--queries', type=int, default=2000, help="Jumlah query per pengukuran.")
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    from benchmarks.load_test import generate_query_mix
+    queries = [query for _, query in generate_query_mix(args.queries, boolean_ratio=0.0)]
+    index_bytes = build_index_bytes()
+    print(f"Ukuran snapshot indeks: {len(index_bytes) / 1024:.1f} KB")
+
+    baseline_qps = None
+    worker_counts = sorted({1, 2, 4, args.workers} & set(range(1, args.workers + 1)))
+    for n_workers in worker_counts:
+        with ParallelSearcher(index_bytes, workers=n_workers) as searcher:
+            start = time.perf_counter()
+            searcher.search_vsm_many(queries, args.k)
+            elapsed = time.perf_counter() - start
+        qps = len(queries) / elapsed
+        baseline_qps = baseline_qps or qps
+        print(f"  {n_workers} worker: {qps:8.1f} query/detik (speedup x{qps / baseline_qps:.2f})")
@@ -1,11 +1,16 @@
 import re
 import os
+import sys
 import json
 import nltk
-from collections import Counter
 from nltk.corpus import stopwords
 from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
 
+# Menambahkan path agar bisa impor modul dari root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src import instrumentation # Hook profiling (no-op jika tidak aktif)
+from src import collection_stats
+
 nltk.download('stopwords')
 nltk.download('punkt')
 
@@ -44,6 +49,13 @@ def remove_stopwords(tokens):
 
 def stem(tokens):
     """Stemming menggunakan Sastrawi."""
+    if instrumentation.enabled():
+        # Cache hit Sastrawi hanya dihitung saat profiling aktif
+        cache = STEMMER.get_cache() if hasattr(STEMMER, 'get_cache') else None
+        if cache is not None:
+            hits = sum(1 for token in tokens if cache.has(token))
+            instrumentation.count('stemmer_cache_hits', hits)
+            instrumentation.count('stemmer_cache_misses', len(tokens) - hits)
     text = ' '.join(tokens)
     stemmed_text = STEMMER.stem(text)
     return stemmed_text.split()
@@ -62,33 +74,9 @@ def get_doc_statistics(processed_docs_tokens):
     """
     Menghitung 10 token tersering dan panjang dokumen.
     (Memenuhi Uji Soal 2)
+    Dihitung dalam satu lintasan oleh collection_stats (sama dengan statistik indexing).
     """
-    stats = {
-        "doc_lengths": {},
-        "top_10_tokens": {}
-    }
-    
-    all_lengths = []
-    
-    for doc_id, tokens in processed_docs_tokens.items():
-        # 1. Hitung panjang dokumen
-        length = len(tokens)
-        stats["doc_lengths"][doc_id] = length
-        all_lengths.append(length)
-        
-        # 2. Hitung 10 token tersering
-        token_counts = Counter(tokens)
-        stats["top_10_tokens"][doc_id] = token_counts.most_common(10)
-        
-    # 3. Hitung distribusi panjang dokumen (data untuk grafik)
-    if all_lengths:
-        stats["distribution"] = {
-            "mean": sum(all_lengths) / len(all_lengths),
-            "min": min(all_lengths),
-            "max": max(all_lengths),
-        }
-    
-    return stats
+    return collection_stats.collect_statistics(processed_docs_tokens, top_n=10).to_report()
 
 # --- Bagian Eksekusi Utama (Diubah Total) ---
 
@@ -101,12 +89,13 @@ if __name__ == '__main__':
 
     # 2. Muat dan Proses Dokumen
     raw_docs = load_documents('data/raw')
-    processed_docs_tokens = {} # Tampung token untuk statistik
+    # Statistik dihitung di lintasan yang sama dengan preprocessing (tanpa lintasan tambahan)
+    collector = collection_stats.CollectionStatistics(top_n=10)
 
     print("--- Memulai Preprocessing Dokumen ---")
     for doc_id, text in raw_docs.items():
         processed_tokens = preprocess_document(text)
-        processed_docs_tokens[doc_id] = processed_tokens # Simpan token
+        collector.add(doc_id, processed_tokens)
         
         # Simpan hasil pemrosesan ke data/processed/
         processed_text = ' '.join(processed_tokens)
@@ -118,7 +107,7 @@ if __name__ == '__main__':
 
     # 3. Jalankan Uji Soal 2
     print("\n--- Menjalankan Uji Soal 2 (Statistik Dokumen) ---")
-    statistics = get_doc_statistics(processed_docs_tokens)
+    statistics = collector.to_report()
     
     # Simpan statistik ke file JSON untuk Laporan
     stats_path = 'reports/statistics.json'
@@ -1,6 +1,9 @@
 import sys
 import argparse
 import os
+import functools
+import contextlib
+import threading
 
 SCRIPT_DIR = os.path.dirname(__file__)
 PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
@@ -9,22 +12,40 @@ DEFAULT_DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'processed')
 # Menambahkan path agar bisa impor modul dari root
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from src import preprocess, boolean_ir, vsm_ir
+from src import preprocess, boolean_ir, vsm_ir, lsa_ir, term_index, instrumentation, index_store, dedup
+from src import collection_stats
+from src.index_manager import IndexManager, IndexSnapshot
 
 # --- Setup Global (MODIFIKASI) ---
-def load_all_data(doc_dir=DEFAULT_DATA_PATH):
-    """Memuat semua indeks dan model yang diperlukan saat startup."""
+def load_docs_tokens(doc_dir=DEFAULT_DATA_PATH):
+    """Memuat dokumen terproses sebagai token."""
     print("Memuat dokumen terproses...")
     processed_docs = preprocess.load_documents(doc_dir)
-    docs_tokens = {doc_id: preprocess.tokenize(text) for doc_id, text in processed_docs.items()}
-    
+    return {doc_id: preprocess.tokenize(text) for doc_id, text in processed_docs.items()}
+
+def load_all_data(doc_dir=DEFAULT_DATA_PATH):
+    """Memuat semua indeks dan model yang diperlukan saat startup."""
+    return build_models(load_docs_tokens(doc_dir))
+
+def build_models(docs_tokens, stats=None):
+    """
+    Membangun indeks Boolean & komponen VSM dari token dokumen.
+    :param stats: CollectionStatistics yang sudah dihitung (opsional); postings, TF
+                  & DF diambil darinya sehingga token tidak dilintasi ulang.
+    """
+    if stats is None:
+        stats = collection_stats.collect_index_statistics(docs_tokens) # Satu lintasan: postings, TF, DF, CF, top-N
+
     print("Membangun Indeks Boolean...")
-    inverted_index = boolean_ir.build_inverted_index(docs_tokens)
+    if stats.postings is not None:
+        inverted_index = stats.postings
+    else:
+        inverted_index = boolean_ir.build_inverted_index(docs_tokens)
     
     print("Membangun komponen VSM (TF, DF, IDF)...")
-    N = len(docs_tokens)
-    tf = vsm_ir.calculate_tf(docs_tokens)
-    df = vsm_ir.calculate_df(docs_tokens)
+    N = stats.n_docs
+    tf = stats.tf
+    df = stats.df
     idf = vsm_ir.calculate_idf(df, N)
     
     # MODIFIKASI: Buat 2 Matriks TF-IDF (Soal 5.1)
@@ -37,58 +58,379 @@ def load_all_data(doc_dir=DEFAULT_DATA_PATH):
     print("Semua model siap.")
     return docs_tokens, inverted_index, idf, tfidf_matrix_sublinear, tfidf_matrix_raw
 
-# Muat semua model saat startup
-DOCS_TOKENS, INVERTED_INDEX, IDF, TFIDF_MATRIX_SUBLINEAR, TFIDF_MATRIX_RAW = load_all_data()
-ALL_DOC_IDS = set(DOCS_TOKENS.keys())
+def shared_index_path():
+    """
+    Path indeks bersama dari env EDUKES_SHARED_INDEX ("1" = lokasi default).
+    :return: str atau None jika mode indeks bersama tidak aktif
+    """
+    value = os.environ.get('EDUKES_SHARED_INDEX', '').strip()
+    if value in ('', '0'):
+        return None
+    return index_store.DEFAULT_INDEX_PATH if value == '1' else value
+
+def lsa_schemes_from_env(value=None):
+    """
+    Skema LSA yang dibangun saat snapshot dimuat, dari env EDUKES_LSA
+    ("1" = sublinear_tf, atau daftar skema dipisah koma, misal "sublinear_tf,raw_tf").
+    :return: Tuple[str] (kosong jika LSA dibangun lazy saat query pertama)
+    """
+    value = (os.environ.get('EDUKES_LSA', '') if value is None else value).strip()
+    if value in ('', '0'):
+        return ()
+    if value == '1':
+        return ('sublinear_tf',)
+    return tuple(scheme.strip() for scheme in value.split(',') if scheme.strip() in ('sublinear_tf', 'raw_tf'))
+
+def build_snapshot(doc_dir=DEFAULT_DATA_PATH):
+    """
+    Membangun satu snapshot indeks lengkap (in-memory atau indeks bersama mmap).
+    Model LSA untuk LSA_PRELOAD_SCHEMES ikut dibangun di sini (di loader/background),
+    sehingga sudah siap sebelum IndexManager memasang snapshot.
+    """
+    snapshot = _build_index_snapshot(doc_dir)
+    try:
+        for scheme in LSA_PRELOAD_SCHEMES:
+            print(f"Membangun model LSA ({scheme}, {LSA_COMPONENTS} dimensi)...")
+            snapshot.lsa_models[(scheme, LSA_COMPONENTS)] = build_lsa_model(snapshot, scheme, LSA_COMPONENTS)
+    except Exception:
+        snapshot.close() # Snapshot gagal tidak pernah dipasang: lepas mmap-nya sekarang
+        raise
+    return snapshot
+
+def _build_index_snapshot(doc_dir):
+    shared_path = shared_index_path()
+    if shared_path:
+        # Mode indeks bersama: semua proses memetakan file indeks yang sama (mmap),
+        # tidak ada dict indeks per proses.
+        mapped = index_store.load_or_publish(doc_dir, shared_path, dedup.threshold_from_env())
+        return IndexSnapshot(
+            mapped.flat.boolean_view, mapped.flat.idf_view, mapped.term_dict, set(mapped.doc_ids()),
+            shared_index=mapped, duplicates=mapped.metadata.get("duplicates", {}),
+            statistics=mapped.metadata.get("statistics", {}),
+            document_statistics=mapped.metadata.get("document_statistics", {}),
+        )
+
+    docs_tokens = load_docs_tokens(doc_dir)
+    duplicates = {}
+    dedup_threshold = dedup.threshold_from_env()
+    if dedup_threshold is not None:
+        # Near-duplicate (sindikasi) digabung: hanya representatif yang diindeks
+        duplicates = dedup.find_near_duplicates(docs_tokens, dedup_threshold)
+        docs_tokens = dedup.collapse_duplicates(docs_tokens, duplicates)
+        print(f"Dedup: {len(duplicates)} klaster, "
+              f"{sum(len(d) for d in duplicates.values())} dokumen duplikat tidak diindeks.")
+
+    stats = collection_stats.collect_index_statistics(docs_tokens)
+    docs_tokens, inverted_index, idf, tfidf_matrix_sublinear, tfidf_matrix_raw = build_models(docs_tokens, stats)
+    tfidf_matrices = {'sublinear_tf': tfidf_matrix_sublinear, 'raw_tf': tfidf_matrix_raw}
+    return IndexSnapshot(
+        inverted_index, idf,
+        # Term dictionary untuk wildcard ("diab*") & koreksi typo ("kolestrol")
+        term_index.TermDictionary(inverted_index.keys()),
+        set(docs_tokens.keys()),
+        docs_tokens=docs_tokens,
+        tfidf_matrices=tfidf_matrices,
+        # Postings berbobot & norma dokumen per skema (untuk batch scoring)
+        vsm_postings={scheme: vsm_ir.build_postings(m) for scheme, m in tfidf_matrices.items()},
+        doc_norms={scheme: vsm_ir.calculate_doc_norms(m) for scheme, m in tfidf_matrices.items()},
+        duplicates=duplicates,
+        statistics=stats.summary(),
+        document_statistics=stats.document_statistics(),
+    )
+
+def build_lsa_model(snapshot, scheme='sublinear_tf', n_components=None):
+    """
+    Faktorisasi TF-IDF satu snapshot (dipanggil loader, atau lazy oleh get_lsa_model).
+    :param n_components: jumlah dimensi laten (None = LSA_COMPONENTS)
+    """
+    if snapshot.shared_index is not None:
+        matrix, doc_ids, terms = lsa_ir.matrix_from_flat_index(snapshot.shared_index.flat, scheme)
+    else:
+        matrix, doc_ids, terms = lsa_ir.matrix_from_tfidf(snapshot.tfidf_matrices[scheme])
+    return lsa_ir.build_lsa_model(matrix, doc_ids, terms, n_components or LSA_COMPONENTS)
+
+def snapshot_version(doc_dir=DEFAULT_DATA_PATH):
+    """Versi indeks: sidik jari korpus (+ mtime file indeks bersama jika dipakai)."""
+    version = index_store.source_signature(doc_dir)
+    shared_path = shared_index_path()
+    if shared_path and os.path.exists(shared_path):
+        # Indeks yang dipublikasikan ulang (misal --force) juga memicu reload
+        version += f":{os.stat(shared_path).st_mtime_ns}"
+    return version
+
+def _publish_globals(snapshot):
+    """
+    Menyalin referensi snapshot ke variabel global lama (kompatibilitas modul lain).
+    Fungsi pencarian di modul ini TIDAK membaca global ini, tetapi snapshot yang di-pin (with_snapshot).
+    """
+    global DOCS_TOKENS, INVERTED_INDEX, IDF, TFIDF_MATRIX_SUBLINEAR, TFIDF_MATRIX_RAW
+    global ALL_DOC_IDS, TERM_DICT, VSM_POSTINGS, DOC_NORMS, SHARED_INDEX
+    DOCS_TOKENS = snapshot.docs_tokens
+    INVERTED_INDEX = snapshot.inverted_index
+    IDF = snapshot.idf
+    TFIDF_MATRIX_SUBLINEAR = snapshot.tfidf_matrices.get('sublinear_tf')
+    TFIDF_MATRIX_RAW = snapshot.tfidf_matrices.get('raw_tf')
+    ALL_DOC_IDS = snapshot.all_doc_ids
+    TERM_DICT = snapshot.term_dict
+    VSM_POSTINGS = snapshot.vsm_postings
+    DOC_NORMS = snapshot.doc_norms
+    SHARED_INDEX = snapshot.shared_index
+
+# Jumlah dimensi laten LSA (dibatasi jumlah dokumen/term korpus)
+LSA_COMPONENTS = int(os.environ.get('EDUKES_LSA_COMPONENTS', lsa_ir.DEFAULT_COMPONENTS))
+# Skema LSA yang dibangun di loader (sebelum swap), dari env EDUKES_LSA
+LSA_PRELOAD_SCHEMES = lsa_schemes_from_env()
+_LSA_LOCK = threading.Lock()
+
+# Muat semua model saat startup. Hot reload: MANAGER.start_watching() memantau
+# data/processed, membangun snapshot baru di background, lalu swap atomik.
+MANAGER = IndexManager(build_snapshot, snapshot_version, on_swap=_publish_globals)
+MANAGER.load()
 
 # --- Core Search Logic (MODIFIKASI) ---
 
-def search_boolean(query_str):
+def with_snapshot(func):
+    """
+    Dekorator: jika pemanggil tidak memberi snapshot, snapshot aktif di-pin
+    (MANAGER.acquire) selama fungsi berjalan. Satu query = satu snapshot, dan
+    snapshot lama yang sedang dipakai tidak ditutup saat hot reload.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, snapshot=None, **kwargs):
+        if snapshot is not None:
+            return func(*args, snapshot=snapshot, **kwargs)
+        with MANAGER.acquire() as snapshot:
+            return func(*args, snapshot=snapshot, **kwargs)
+    return wrapper
+
+def duplicates_of(doc_id, snapshot=None):
+    """Dokumen near-duplicate yang diwakili doc_id (kosong jika dedup nonaktif)."""
+    return (snapshot or MANAGER.current()).duplicates.get(doc_id, [])
+
+@with_snapshot
+def search_boolean(query_str, snapshot=None):
     """Search menggunakan Boolean Model."""
-    results = boolean_ir.parse_and_execute_boolean_query(query_str, INVERTED_INDEX, ALL_DOC_IDS)
+    with instrumentation.timer('search_boolean'):
+        with instrumentation.timer('preprocess'):
+            query_tokens = boolean_ir.preprocess_boolean_query(query_str, term_dict=snapshot.term_dict)
+        with instrumentation.timer('execute'):
+            results = boolean_ir.execute_boolean_query(query_tokens, snapshot.inverted_index, term_dict=snapshot.term_dict)
     # (Explainability Boolean bisa ditambahkan di sini jika perlu)
     return [(doc_id, 1.0, []) for doc_id in results] # Tambah list kosong untuk konsistensi
 
-def search_vsm(query_str, k, scheme='sublinear_tf'):
+@with_snapshot
+def search_vsm(query_str, k, scheme='sublinear_tf', snapshot=None):
     """Search menggunakan VSM (MODIFIKASI: memilih skema dan menambah explain)."""
+    if snapshot.shared_index is not None:
+        with instrumentation.timer('search_vsm'):
+            return snapshot.shared_index.search_vsm(query_str, k, scheme)
     
     # Pilih matriks yang sesuai
-    tfidf_matrix = TFIDF_MATRIX_SUBLINEAR if scheme == 'sublinear_tf' else TFIDF_MATRIX_RAW
+    tfidf_matrix = snapshot.tfidf_matrices['sublinear_tf' if scheme == 'sublinear_tf' else 'raw_tf']
 
-    query_processed_tokens = preprocess.preprocess_document(query_str)
-    query_vector = vsm_ir.vectorize_query(query_processed_tokens, IDF, scheme=scheme)
-    rankings = vsm_ir.rank_documents(tfidf_matrix, query_vector, k)
-    
-    # MODIFIKASI: Tambahkan data 'explain' (Soal 3 & 5.2)
-    explained_rankings = []
-    query_terms_set = set(query_processed_tokens)
-    for doc_id, score in rankings:
-        doc_tokens_set = set(DOCS_TOKENS[doc_id])
-        # Cari irisan antara token query dan token dokumen
-        matching_terms = list(query_terms_set.intersection(doc_tokens_set))
-        explained_rankings.append((doc_id, score, matching_terms[:5])) # Ambil 5 top term
+    with instrumentation.timer('search_vsm'):
+        # Token query diekspansi: wildcard -> term cocok, typo -> koreksi terdekat
+        with instrumentation.timer('preprocess'):
+            query_processed_tokens = term_index.expand_query_tokens(query_str, snapshot.term_dict)
+        instrumentation.observe('query_terms', len(query_processed_tokens), instrumentation.COUNT_BUCKETS)
+        with instrumentation.timer('vectorize_query'):
+            query_vector = vsm_ir.vectorize_query(query_processed_tokens, snapshot.idf, scheme=scheme)
+        with instrumentation.timer('rank_documents'):
+            rankings = vsm_ir.rank_documents(tfidf_matrix, query_vector, k)
+        
+        # MODIFIKASI: Tambahkan data 'explain' (Soal 3 & 5.2)
+        with instrumentation.timer('explain'):
+            explained_rankings = []
+            query_terms_set = set(query_processed_tokens)
+            for doc_id, score in rankings:
+                doc_tokens_set = set(snapshot.docs_tokens[doc_id])
+                # Cari irisan antara token query dan token dokumen
+                matching_terms = list(query_terms_set.intersection(doc_tokens_set))
+                explained_rankings.append((doc_id, score, matching_terms[:5])) # Ambil 5 top term
         
     return explained_rankings
 
+@with_snapshot
+def get_lsa_model(snapshot=None, scheme='sublinear_tf', n_components=None):
+    """
+    Model LSA untuk snapshot, skema & jumlah dimensi tertentu. Skema di EDUKES_LSA
+    (dengan LSA_COMPONENTS) sudah dibangun oleh loader; kombinasi lain dihitung
+    sekali saat pertama dipakai (cocok untuk CLI/eval, tetapi query pertama
+    menunggu SVD), lalu disimpan di snapshot.
+    :param n_components: jumlah dimensi laten (None = LSA_COMPONENTS)
+    """
+    key = (scheme, n_components or LSA_COMPONENTS)
+    model = snapshot.lsa_models.get(key)
+    if model is None:
+        with _LSA_LOCK:
+            model = snapshot.lsa_models.get(key)
+            if model is None:
+                model = build_lsa_model(snapshot, *key)
+                snapshot.lsa_models[key] = model
+    return model
+
+@with_snapshot
+def search_lsa(query_str, k, scheme='sublinear_tf', block_size=None, n_components=None, snapshot=None):
+    """
+    Search menggunakan LSA (ruang laten hasil truncated SVD dari TF-IDF).
+    Dokumen bisa terambil walau tidak memuat istilah query (explain bisa kosong).
+    """
+    with instrumentation.timer('search_lsa'):
+        with instrumentation.timer('preprocess'):
+            query_processed_tokens = term_index.expand_query_tokens(query_str, snapshot.term_dict)
+        with instrumentation.timer('vectorize_query'):
+            query_vector = vsm_ir.vectorize_query(query_processed_tokens, snapshot.idf, scheme=scheme)
+        with instrumentation.timer('lsa_model'):
+            model = get_lsa_model(snapshot=snapshot, scheme=scheme, n_components=n_components)
+        with instrumentation.timer('rank_documents'):
+            rankings = model.rank(query_vector, k, block_size)
+        with instrumentation.timer('explain'):
+            query_terms = list(dict.fromkeys(query_processed_tokens))
+            explained_rankings = [
+                (doc_id, score, explain_matches(doc_id, query_terms, snapshot=snapshot))
+                for doc_id, score in rankings
+            ]
+    return explained_rankings
+
+# --- Batch Search (untuk Evaluasi) ---
+
+@with_snapshot
+def explain_matches(doc_id, query_terms, max_terms=5, snapshot=None):
+    """Istilah query yang muncul di dokumen (explain), dicek via inverted index."""
+    inverted_index = snapshot.inverted_index
+    matching_terms = [term for term in query_terms if doc_id in inverted_index.get(term, ())]
+    return matching_terms[:max_terms]
+
+@with_snapshot
+def preprocess_queries(queries, snapshot=None):
+    """
+    Preprocess setiap query UNIK sekali saja (stemming adalah langkah termahal).
+    :param snapshot: IndexSnapshot yang dipakai (default: snapshot aktif)
+    :return: Dict[str, List[str]] -> {query_str: token_terekspansi}
+    """
+    term_dict = snapshot.term_dict
+    processed = {}
+    with instrumentation.timer('preprocess_queries'):
+        for query_str in queries:
+            if query_str in processed:
+                instrumentation.count('query_cache_hits')
+                continue
+            processed[query_str] = term_index.expand_query_tokens(query_str, term_dict)
+    return processed
+
+@with_snapshot
+def score_vsm_batch(query_tokens_list, k, schemes=('sublinear_tf', 'raw_tf'), snapshot=None):
+    """
+    Scoring banyak query (sudah diproses) untuk beberapa skema sekaligus.
+    :param snapshot: IndexSnapshot yang dipakai (default: snapshot aktif)
+    :return: Dict[str, List[List[Tuple]]] -> {scheme: [hasil_query_1, ...]}
+    """
+    if snapshot.shared_index is not None:
+        with instrumentation.timer('rank_documents_batch'):
+            return {scheme: [snapshot.shared_index.score_vsm(tokens, k, scheme) for tokens in query_tokens_list]
+                    for scheme in schemes}
+
+    results_by_scheme = {}
+    for scheme in schemes:
+        with instrumentation.timer('vectorize_query'):
+            query_vectors = [vsm_ir.vectorize_query(tokens, snapshot.idf, scheme=scheme) for tokens in query_tokens_list]
+        with instrumentation.timer('rank_documents_batch'):
+            all_rankings = vsm_ir.rank_documents_batch(
+                snapshot.vsm_postings[scheme], snapshot.doc_norms[scheme], query_vectors, k,
+            )
+
+        scheme_results = []
+        for tokens, rankings in zip(query_tokens_list, all_rankings):
+            query_terms = list(dict.fromkeys(tokens)) # Unik, urutan query dipertahankan
+            scheme_results.append([
+                (doc_id, score, explain_matches(doc_id, query_terms, snapshot=snapshot)) for doc_id, score in rankings
+            ])
+        results_by_scheme[scheme] = scheme_results
+    return results_by_scheme
+
+@with_snapshot
+def search_vsm_batch(queries, k, schemes=('sublinear_tf', 'raw_tf'), snapshot=None):
+    """
+    Versi batch dari search_vsm: setiap query unik diproses sekali, lalu
+    semua query & skema diskor dengan satu lintasan postings per skema.
+
+    :param queries: List[str]
+    :return: Dict[str, List[List[Tuple[str, float, List[str]]]]]
+             {scheme: [hasil untuk queries[0], hasil untuk queries[1], ...]}
+    """
+    processed = preprocess_queries(queries, snapshot=snapshot)
+    unique_queries = list(processed.keys())
+    unique_results = score_vsm_batch([processed[q] for q in unique_queries], k, schemes, snapshot=snapshot)
+
+    results_by_scheme = {}
+    for scheme, scheme_results in unique_results.items():
+        by_query = dict(zip(unique_queries, scheme_results))
+        results_by_scheme[scheme] = [by_query[query_str] for query_str in queries]
+    return results_by_scheme
+
+@with_snapshot
+def search_lsa_batch(queries, k, scheme='sublinear_tf', block_size=None, n_components=None, snapshot=None):
+    """
+    Versi batch dari search_lsa: setiap query unik diproses sekali.
+    :return: List[List[Tuple[str, float, List[str]]]] sesuai urutan queries
+    """
+    processed = preprocess_queries(queries, snapshot=snapshot)
+    model = get_lsa_model(snapshot=snapshot, scheme=scheme, n_components=n_components)
+
+    unique_results = {}
+    with instrumentation.timer('rank_documents_lsa'):
+        for query_str, tokens in processed.items():
+            query_vector = vsm_ir.vectorize_query(tokens, snapshot.idf, scheme=scheme)
+            query_terms = list(dict.fromkeys(tokens))
+            unique_results[query_str] = [
+                (doc_id, score, explain_matches(doc_id, query_terms, snapshot=snapshot))
+                for doc_id, score in model.rank(query_vector, k, block_size)
+            ]
+    return [unique_results[query_str] for query_str in queries]
+
+@with_snapshot
+def search_boolean_batch(queries, snapshot=None):
+    """
+    Versi batch dari search_boolean: setiap query unik diproses dan
+    dieksekusi sekali saja.
+    :return: List[List[Tuple[str, float, List]]] sesuai urutan queries
+    """
+    unique_results = {}
+    for query_str in queries:
+        if query_str not in unique_results:
+            query_tokens = boolean_ir.preprocess_boolean_query(query_str, term_dict=snapshot.term_dict)
+            doc_ids = boolean_ir.execute_boolean_query(query_tokens, snapshot.inverted_index, term_dict=snapshot.term_dict)
+            unique_results[query_str] = [(doc_id, 1.0, []) for doc_id in doc_ids]
+    return [unique_results[query_str] for query_str in queries]
+
 # --- CLI Interface (MODIFIKASI) ---
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Mini Search Engine EduKesehatan CLI. (Soal 5.2)")
-    parser.add_argument('--model', choices=['boolean', 'vsm'], required=True, help="Model pencarian: boolean atau vsm.")
-    parser.add_argument('--scheme', choices=['sublinear_tf', 'raw_tf'], default='sublinear_tf', help="Skema TF-IDF untuk VSM (Soal 5.1).")
-    parser.add_argument('--k', type=int, default=5, help="Jumlah top dokumen untuk VSM.")
-    parser.add_argument('--query', required=True, help="Query pencarian (gunakan tanda kutip).")
+    parser.add_argument('--model', choices=['boolean', 'vsm', 'lsa'], required=True, help="Model pencarian: boolean, vsm, atau lsa.")
+    parser.add_argument('--scheme', choices=['sublinear_tf', 'raw_tf'], default='sublinear_tf', help="Skema TF-IDF untuk VSM/LSA (Soal 5.1).")
+    parser.add_argument('--k', type=int, default=5, help="Jumlah top dokumen untuk VSM/LSA.")
+    parser.add_argument('--lsa-components', type=int, default=LSA_COMPONENTS, help="Jumlah dimensi laten LSA.")
+    parser.add_argument('--block-size', type=int, default=None, help="Skor dokumen LSA per blok (top-k bertahap).")
+    parser.add_argument('--profile', action='store_true', help="Tampilkan profil waktu per tahap & counter.")
+    parser.add_argument('--profile-format', choices=['json', 'prometheus'], default='json', help="Format output --profile.")
+    parser.add_argument('--query', required=True, help="Query pencarian (gunakan tanda kutip). Mendukung wildcard, misal 'diab*'.")
     
     args = parser.parse_args()
     
     results = []
-    if args.model == 'boolean':
-        print(f"\n--- Hasil Boolean Retrieval ---")
-        results = search_boolean(args.query)
-            
-    elif args.model == 'vsm':
-        print(f"\n--- Hasil VSM Retrieval (Top-{args.k}, Scheme: {args.scheme}) ---")
-        results = search_vsm(args.query, args.k, args.scheme)
+    with instrumentation.profile() if args.profile else contextlib.nullcontext() as profiler:
+        if args.model == 'boolean':
+            print(f"\n--- Hasil Boolean Retrieval ---")
+            results = search_boolean(args.query)
+                
+        elif args.model == 'vsm':
+            print(f"\n--- Hasil VSM Retrieval (Top-{args.k}, Scheme: {args.scheme}) ---")
+            results = search_vsm(args.query, args.k, args.scheme)
+
+        elif args.model == 'lsa':
+            print(f"\n--- Hasil LSA Retrieval (Top-{args.k}, Scheme: {args.scheme}, Dimensi: {args.lsa_components}) ---")
+            results = search_lsa(args.query, args.k, args.scheme, args.block_size, args.lsa_components)
     
     # Cetak hasil
     if results:
@@ -98,5 +440,12 @@ if __name__ == '__main__':
                 explain_str = f"| Explain (Istilah Cocok): {', '.join(explain_terms)}" # (Soal 3 & 5.2)
             
             print(f"-> {doc_id.ljust(15)} | Skor: {score:<8.4f} {explain_str}")
+            duplicates = duplicates_of(doc_id)
+            if duplicates:
+                print(f"   {''.ljust(15)} | Salinan serupa: {', '.join(duplicates)}")
     else:
-        print("Tidak ada dokumen yang relevan.")
\ No newline at end of file
+        print("Tidak ada dokumen yang relevan.")
+
+    if args.profile:
+        print("\n--- Profil Eksekusi ---")
+        print(profiler.to_json() if args.profile_format == 'json' else profiler.to_prometheus())
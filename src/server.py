@@ -0,0 +1,334 @@
+import sys
+import os
+import json
+import time
+import asyncio
+import argparse
+import traceback
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+
+# Menambahkan path agar bisa impor modul dari root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src import search # Indeks dimuat sekali saat impor, lalu dipakai semua request
+
+"""
+Layanan HTTP/JSON asyncio (tanpa dependensi luar) di atas indeks yang sudah dimuat.
+Endpoint:
+- GET/POST /search/vsm      {"query": "...", "k": 5, "scheme": "sublinear_tf"}
+- GET/POST /search/boolean  {"query": "..."}
+- GET      /health
+Hasil berbentuk sama dengan search.py: [[doc_id, score, explain], ...].
+Request yang datang bersamaan digabung menjadi micro-batch (MicroBatcher)
+dan diskor sekaligus; stemming & scoring dijalankan di thread executor
+agar event loop tetap responsif.
+"""
+
+MAX_BODY_BYTES = 64 * 1024
+SCHEMES = ('sublinear_tf', 'raw_tf')
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+class BadRequest(Exception):
+    """Request tidak valid (dikirim sebagai HTTP 400)."""
+    status = 400
+
+class PayloadTooLarge(BadRequest):
+    """Body melebihi MAX_BODY_BYTES (dikirim sebagai HTTP 413)."""
+    status = 413
+
+# --- Micro-Batching ---
+
+class MicroBatcher:
+    """
+    Mengumpulkan request hingga max_batch_size atau max_wait_ms
+    (mana yang lebih dulu), lalu memproses semuanya dalam satu panggilan.
+    """
+
+    def __init__(self, process_batch, executor, max_batch_size=32, max_wait_ms=5.0):
+        self.process_batch = process_batch # fungsi sinkron: List[item] -> List[hasil]
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue()
+        self.batches_processed = 0
+        self.items_processed = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self.process_batch, items)
+            except Exception as e: # Satu batch gagal -> semua request di batch itu gagal
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches_processed += 1
+            self.items_processed += len(items)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+def with_duplicates(results, snapshot):
+    """(hasil, {doc_id: [duplikat]}) dari snapshot yang sama dengan hasilnya."""
+    duplicates = {doc_id: search.duplicates_of(doc_id, snapshot=snapshot) for doc_id, _, _ in results}
+    return results, {doc_id: dups for doc_id, dups in duplicates.items() if dups}
+
+def process_vsm_batch(items):
+    """
+    Item: (query, k, scheme). Query unik di-stem sekali, lalu setiap
+    skema diskor dengan satu lintasan postings (search.score_vsm_batch).
+    :return: List[(hasil, duplikat)] sesuai urutan items
+    """
+    with search.MANAGER.acquire() as snapshot: # Satu batch = satu snapshot (aman saat hot reload)
+        processed = search.preprocess_queries([query for query, _, _ in items], snapshot=snapshot)
+        results = [None] * len(items)
+        for scheme in SCHEMES:
+            indices = [i for i, (_, _, item_scheme) in enumerate(items) if item_scheme == scheme]
+            if not indices:
+                continue
+            max_k = max(items[i][1] for i in indices)
+            query_tokens_list = [processed[items[i][0]] for i in indices]
+            scored = search.score_vsm_batch(query_tokens_list, max_k, [scheme], snapshot=snapshot)[scheme]
+            for i, rankings in zip(indices, scored):
+                results[i] = with_duplicates(rankings[:items[i][1]], snapshot)
+    return results
+
+def process_boolean_batch(items):
+    """Item: query string. :return: List[(hasil, duplikat)] sesuai urutan items"""
+    with search.MANAGER.acquire() as snapshot:
+        return [with_duplicates(results, snapshot)
+                for results in search.search_boolean_batch(items, snapshot=snapshot)]
+
+# --- HTTP ---
+
+async def read_request(reader):
+    """
+    Parser HTTP/1.1 minimal.
+    :return: (method, path, params, keep_alive) atau None jika koneksi ditutup
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, version = request_line.decode('latin-1').split()
+    except ValueError:
+        raise BadRequest("Request line tidak valid")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    url = urlsplit(target)
+    params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+    try:
+        length = int(headers.get('content-length', 0) or 0)
+    except ValueError:
+        raise BadRequest("Header Content-Length tidak valid")
+    if length < 0:
+        raise BadRequest("Header Content-Length tidak valid")
+    if length > MAX_BODY_BYTES:
+        raise PayloadTooLarge(f"Body melebihi {MAX_BODY_BYTES} byte")
+    if length:
+        body = await reader.readexactly(length)
+        try:
+            payload = json.loads(body.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise BadRequest("Body harus JSON")
+        if not isinstance(payload, dict):
+            raise BadRequest("Body JSON harus berupa object")
+        params.update(payload)
+
+    connection = headers.get('connection', '').lower()
+    keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+    return method.upper(), url.path, params, keep_alive
+
+def write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + body)
+
+def parse_search_params(params, model):
+    query = params.get('query', params.get('q'))
+    if not isinstance(query, str) or not query.strip():
+        raise BadRequest("Parameter 'query' wajib diisi")
+    if model == 'boolean':
+        return query
+
+    k = params.get('k', 5)
+    if isinstance(k, str): # Query string GET
+        try:
+            k = int(k)
+        except ValueError:
+            raise BadRequest("Parameter 'k' harus bilangan bulat")
+    if isinstance(k, bool) or not isinstance(k, int): # JSON true / 2.7 ditolak
+        raise BadRequest("Parameter 'k' harus bilangan bulat")
+    if k < 1:
+        raise BadRequest("Parameter 'k' minimal 1")
+    scheme = params.get('scheme', 'sublinear_tf')
+    if scheme not in SCHEMES:
+        raise BadRequest(f"Parameter 'scheme' harus salah satu dari {list(SCHEMES)}")
+    return query, k, scheme
+
+# --- Server ---
+
+class SearchServer:
+    """Server pencarian asyncio dengan micro-batching per model."""
+
+    def __init__(self, host='127.0.0.1', port=8765, max_batch_size=32, max_wait_ms=5.0, executor_workers=2):
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=executor_workers, thread_name_prefix='edukes-search')
+        self.batchers = {
+            'vsm': MicroBatcher(process_vsm_batch, self.executor, max_batch_size, max_wait_ms),
+            'boolean': MicroBatcher(process_boolean_batch, self.executor, max_batch_size, max_wait_ms),
+        }
+        self._server = None
+
+    async def start(self):
+        for batcher in self.batchers.values():
+            batcher.start()
+        self._server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        # Port 0 -> port acak dari OS (berguna untuk pengujian)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for batcher in self.batchers.values():
+            await batcher.stop()
+        self.executor.shutdown(wait=False)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    method, path, params, keep_alive = request
+                    status, payload = await self.route(method, path, params)
+                except BadRequest as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception: # Detail error hanya dicatat di log server, tidak dikirim ke klien
+                    traceback.print_exc()
+                    status, payload = 500, {"error": "Terjadi kesalahan internal"}
+
+                write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def route(self, method, path, params):
+        if path == '/health':
+            return 200, {
+                "status": "ok",
+                "documents": len(search.MANAGER.current().all_doc_ids),
+                "index": search.MANAGER.status(),
+                "batches": {model: {"batches": b.batches_processed, "requests": b.items_processed}
+                            for model, b in self.batchers.items()},
+            }
+
+        if path not in ('/search/vsm', '/search/boolean'):
+            return 404, {"error": f"Path '{path}' tidak ditemukan"}
+        if method not in ('GET', 'POST'):
+            return 405, {"error": "Gunakan GET atau POST"}
+
+        model = path.rsplit('/', 1)[-1]
+        item = parse_search_params(params, model)
+        results, duplicates = await self.batchers[model].submit(item)
+
+        query = item if model == 'boolean' else item[0]
+        return 200, {
+            "model": model,
+            "query": query,
+            "results": [[doc_id, score, list(explain)] for doc_id, score, explain in results],
+            # Near-duplicate yang diwakili setiap hasil (hanya jika dedup aktif)
+            "duplicates": duplicates,
+        }
+
+async def main(args):
+    if args.watch_interval > 0:
+        search.MANAGER.start_watching(args.watch_interval)
+    server = await SearchServer(args.host, args.port, args.max_batch, args.max_wait_ms, args.workers).start()
+    print(f"Server EduKesehatan berjalan di http://{server.host}:{server.port}")
+    print("Endpoint: /search/vsm, /search/boolean, /health (Ctrl+C untuk berhenti)")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Layanan HTTP/JSON EduKesehatan (asyncio + micro-batching).")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch', type=int, default=32, help="Ukuran maksimum micro-batch.")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help="Waktu tunggu maksimum pengisian batch (ms).")
+    parser.add_argument('--workers', type=int, default=2, help="Jumlah thread executor untuk stemming & scoring.")
+    parser.add_argument('--watch-interval', type=float, default=0.0,
+                        help="Interval (detik) pemantauan data/processed untuk hot reload indeks (0 = nonaktif).")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        print("\nServer dihentikan.")
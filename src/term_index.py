@@ -0,0 +1,270 @@
+import re
+import sys
+import os
+import bisect
+import fnmatch
+from collections import Counter
+
+# Menambahkan path agar bisa impor modul dari root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src import preprocess # Diperlukan untuk memproses term query
+
+"""
+Modul ini berisi Term Dictionary untuk lookup istilah yang toleran.
+Termasuk:
+1. Sorted term dictionary (prefix lookup dengan bisect)
+2. K-gram index (ekspansi wildcard, misal "diab*" atau "*lestrol")
+3. Koreksi typo via k-gram overlap + edit distance (misal "kolestrol")
+4. parse_query_terms & expand_query_terms (dipakai Boolean dan VSM)
+"""
+
+WILDCARD = '*'
+MAX_EXPANSIONS = 50 # Batas ekspansi agar query wildcard tidak meledak
+
+# --- Edit Distance ---
+
+def edit_distance(a, b, max_distance=None):
+    """
+    Levenshtein distance (insert, delete, substitute) dengan 2 baris DP.
+    Jika max_distance diberikan, perhitungan dihentikan lebih awal dan
+    mengembalikan max_distance + 1 begitu jarak pasti melebihi batas.
+
+    :param a: str
+    :param b: str
+    :param max_distance: int atau None
+    :return: int
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+    if not b:
+        return len(a)
+
+    previous_row = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current_row = [i]
+        for j, char_b in enumerate(b, 1):
+            cost = 0 if char_a == char_b else 1
+            current_row.append(min(
+                previous_row[j] + 1,        # delete
+                current_row[j - 1] + 1,     # insert
+                previous_row[j - 1] + cost  # substitute
+            ))
+        if max_distance is not None and min(current_row) > max_distance:
+            return max_distance + 1
+        previous_row = current_row
+    return previous_row[-1]
+
+def default_max_distance(term):
+    """
+    Toleransi typo berdasarkan panjang term.
+    Term pendek (<= 3 huruf) tidak dikoreksi agar tidak salah tebak.
+    """
+    if len(term) <= 3:
+        return 0
+    if len(term) <= 5:
+        return 1
+    return 2
+
+# --- Term Dictionary ---
+
+class TermDictionary:
+    """
+    Kamus term terurut dengan side index k-gram.
+    Side index dibangun secara lazy saat pertama kali dibutuhkan,
+    sehingga startup tidak bertambah lambat untuk query biasa.
+    Jika kgram_index diberikan (misal FlatIndex.kgram_view di buffer bersama),
+    side index itu dipakai langsung dan tidak dibangun di proses ini.
+    """
+
+    def __init__(self, terms, k=2, presorted=False, kgram_index=None):
+        if presorted:
+            # Urutan terurut dipakai apa adanya (misal FlatIndex.terms di shared memory)
+            self.terms = terms
+            self.term_set = None
+        else:
+            self.terms = sorted(set(terms))
+            self.term_set = set(self.terms)
+        self.k = k
+        self._kgram_index = kgram_index
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, term):
+        if self.term_set is not None:
+            return term in self.term_set
+        i = bisect.bisect_left(self.terms, term)
+        return i < len(self.terms) and self.terms[i] == term
+
+    # --- Side Index (Lazy) ---
+
+    def _kgrams(self, text):
+        """Menghasilkan k-gram dari sebuah string (sudah termasuk marker '$')."""
+        return {text[i:i + self.k] for i in range(len(text) - self.k + 1)}
+
+    def _get_kgram_index(self):
+        """K-gram index: {gram: [term_id, ...]} (term_id terurut naik)."""
+        if self._kgram_index is None:
+            kgram_index = {}
+            for term_id, term in enumerate(self.terms):
+                for gram in self._kgrams('$' + term + '$'):
+                    kgram_index.setdefault(gram, []).append(term_id)
+            self._kgram_index = kgram_index
+        return self._kgram_index
+
+    # --- Lookup ---
+
+    def prefix(self, prefix, limit=MAX_EXPANSIONS):
+        """
+        Semua term yang diawali 'prefix' (O(log n + m) via bisect).
+
+        :return: List[str] terurut
+        """
+        start = bisect.bisect_left(self.terms, prefix)
+        end = bisect.bisect_left(self.terms, prefix + '\uffff', lo=start)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.terms[start:end]
+
+    def wildcard(self, pattern, limit=MAX_EXPANSIONS):
+        """
+        Ekspansi pola wildcard ('*' = nol atau lebih huruf).
+        Kandidat diambil dari irisan postings k-gram, lalu diverifikasi regex.
+
+        :param pattern: str, misal "diab*", "*lestrol", "ko*trol"
+        :return: List[str] terurut
+        """
+        if WILDCARD not in pattern:
+            return [pattern] if pattern in self else []
+
+        # Kasus umum "diab*" cukup dengan range bisect
+        if pattern.endswith(WILDCARD) and pattern.count(WILDCARD) == 1:
+            return self.prefix(pattern[:-1], limit=limit)
+
+        kgram_index = self._get_kgram_index()
+        grams = set()
+        for piece in ('$' + pattern + '$').split(WILDCARD):
+            if len(piece) >= self.k:
+                grams.update(self._kgrams(piece))
+
+        if grams:
+            postings = sorted((kgram_index.get(gram, []) for gram in grams), key=len)
+            candidate_ids = set(postings[0])
+            for posting in postings[1:]:
+                candidate_ids.intersection_update(posting)
+                if not candidate_ids:
+                    return []
+            candidates = (self.terms[term_id] for term_id in sorted(candidate_ids))
+        else:
+            candidates = iter(self.terms) # Pola seperti "*" atau "a*"
+
+        matcher = re.compile(fnmatch.translate(pattern))
+        results = []
+        for term in candidates:
+            if matcher.match(term):
+                results.append(term)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def correct(self, term, max_distance=None, limit=5):
+        """
+        Saran koreksi typo dalam radius edit distance.
+        Setiap edit merusak paling banyak k buah k-gram, sehingga kandidat
+        harus berbagi minimal (jumlah_gram - k * max_distance) k-gram dengan
+        term. Hanya kandidat yang lolos filter ini yang dihitung jaraknya.
+
+        :return: List[Tuple[str, int]] -> [(term, jarak), ...] terdekat dulu
+        """
+        if max_distance is None:
+            max_distance = default_max_distance(term)
+        if max_distance <= 0:
+            return [(term, 0)] if term in self else []
+
+        kgram_index = self._get_kgram_index()
+        query_grams = self._kgrams('$' + term + '$')
+        min_overlap = len(query_grams) - self.k * max_distance
+
+        if min_overlap > 0:
+            overlap = Counter()
+            for gram in query_grams:
+                overlap.update(kgram_index.get(gram, ()))
+            candidate_ids = [term_id for term_id, shared in overlap.items() if shared >= min_overlap]
+        else:
+            candidate_ids = range(len(self.terms)) # Filter k-gram tidak berlaku, scan penuh
+
+        matches = []
+        for term_id in candidate_ids:
+            candidate = self.terms[term_id]
+            distance = edit_distance(term, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, candidate))
+
+        matches.sort()
+        return [(match, distance) for distance, match in matches[:limit]]
+
+    def expand(self, term, max_distance=None):
+        """
+        Ekspansi satu term query menjadi term yang ada di vocabulary.
+        - Pola wildcard -> semua term yang cocok
+        - Term dikenal  -> term itu sendiri
+        - Term asing    -> koreksi dengan jarak terkecil
+        """
+        if WILDCARD in term:
+            return self.wildcard(term)
+        if term in self:
+            return [term]
+
+        suggestions = self.correct(term, max_distance=max_distance)
+        if not suggestions:
+            return []
+        best_distance = suggestions[0][1]
+        return [match for match, distance in suggestions if distance == best_distance]
+
+# --- Integrasi Query ---
+
+def parse_query_terms(query_str):
+    """
+    Preprocessing query yang mempertahankan pola wildcard.
+    Kata tanpa '*' diproses seperti dokumen (clean, stopword, stem),
+    kata dengan '*' hanya di-lowercase (stemming akan merusak pola).
+
+    :return: List[str], misal ["gula", "diab*"]
+    """
+    items = []
+    pending_words = [] # Kata biasa dikumpulkan agar di-stem dalam satu panggilan
+
+    for raw_word in query_str.lower().split():
+        if WILDCARD not in raw_word:
+            pending_words.append(raw_word)
+            continue
+
+        if pending_words:
+            items.extend(preprocess.preprocess_document(' '.join(pending_words)))
+            pending_words = []
+        pattern = re.sub(r'[^a-z*]', '', raw_word)
+        if pattern.strip(WILDCARD):
+            items.append(pattern)
+
+    if pending_words:
+        items.extend(preprocess.preprocess_document(' '.join(pending_words)))
+    return items
+
+def expand_query_terms(query_items, term_dict, max_distance=None):
+    """
+    Ekspansi setiap item query menggunakan TermDictionary.
+
+    :param query_items: List[str] dari parse_query_terms
+    :param term_dict: TermDictionary
+    :return: List[List[str]] -> satu grup ekspansi per item query
+    """
+    return [term_dict.expand(item, max_distance=max_distance) for item in query_items]
+
+def expand_query_tokens(query_str, term_dict, max_distance=None):
+    """Versi datar (flat) dari ekspansi query, untuk vektorisasi VSM."""
+    groups = expand_query_terms(parse_query_terms(query_str), term_dict, max_distance)
+    return [term for group in groups for term in group]
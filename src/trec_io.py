@@ -0,0 +1,123 @@
+import os
+import csv
+import json
+
+"""
+Modul ini berisi pembaca/penulis file evaluasi berformat standar TREC.
+Termasuk:
+1. Qrels  : "qid iter doc_id relevance"        (misal "Q1 0 doc01.txt 2")
+2. Run    : "qid Q0 doc_id rank score tag"     (misal "Q1 Q0 doc04.txt 1 0.52 vsm")
+3. Query  : "qid<TAB>query"                    (satu query per baris)
+Semua pembaca bersifat streaming (generator baris per baris),
+sehingga file berisi ribuan query tidak perlu dimuat sekaligus.
+"""
+
+# --- Pembaca Streaming ---
+
+def _iter_fields(path, min_fields):
+    """Membaca file baris demi baris, melewati baris kosong & komentar '#'."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = line.split()
+            if len(fields) < min_fields:
+                raise ValueError(f"{path}:{line_no}: format tidak valid -> '{line}'")
+            yield fields
+
+def iter_qrels(path):
+    """
+    Streaming qrels TREC.
+    :return: Generator[Tuple[str, str, int]] -> (qid, doc_id, relevance)
+    """
+    for fields in _iter_fields(path, 4):
+        yield fields[0], fields[2], int(fields[3])
+
+def iter_run(path):
+    """
+    Streaming run TREC.
+    :return: Generator[Tuple[str, str, int, float]] -> (qid, doc_id, rank, score)
+    """
+    for fields in _iter_fields(path, 6):
+        yield fields[0], fields[2], int(fields[3]), float(fields[4])
+
+def iter_queries(path):
+    """
+    Streaming file query "qid<TAB>query".
+    :return: Generator[Tuple[str, str]] -> (qid, query)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            qid, sep, query = line.partition('\t')
+            if not sep:
+                raise ValueError(f"{path}:{line_no}: butuh format 'qid<TAB>query'")
+            yield qid, query.strip()
+
+# --- Loader (Dikelompokkan per Query) ---
+
+def load_qrels(path):
+    """
+    :return: Dict[str, Dict[str, int]] -> {"Q1": {"doc01.txt": 1}, ...}
+    """
+    qrels = {}
+    for qid, doc_id, relevance in iter_qrels(path):
+        qrels.setdefault(qid, {})[doc_id] = relevance
+    return qrels
+
+def load_run(path):
+    """
+    :return: Dict[str, List[str]] -> {"Q1": ["doc04.txt", ...]} terurut berdasarkan rank
+    """
+    ranked = {}
+    for qid, doc_id, rank, score in iter_run(path):
+        ranked.setdefault(qid, []).append((rank, -score, doc_id))
+    return {qid: [doc_id for _, _, doc_id in sorted(entries)] for qid, entries in ranked.items()}
+
+def load_queries(path):
+    """:return: Dict[str, str] -> {"Q1": "cuci tangan sabun kuman", ...}"""
+    return dict(iter_queries(path))
+
+# --- Penulis ---
+
+def _ensure_parent_dir(path):
+    parent = os.path.dirname(path)
+    if parent and not os.path.exists(parent):
+        os.makedirs(parent)
+
+def write_qrels(path, qrels):
+    """Menulis qrels dict ke format TREC."""
+    _ensure_parent_dir(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        for qid, judgments in qrels.items():
+            for doc_id, relevance in judgments.items():
+                f.write(f"{qid} 0 {doc_id} {relevance}\n")
+
+def write_run(path, run_results, tag='edukes'):
+    """
+    Menulis hasil retrieval ke format run TREC.
+    :param run_results: Dict[str, List[Tuple[str, float, ...]]] -> {qid: [(doc_id, score, ...), ...]}
+    """
+    _ensure_parent_dir(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        for qid, results in run_results.items():
+            for rank, result in enumerate(results, 1):
+                f.write(f"{qid} Q0 {result[0]} {rank} {result[1]:.6f} {tag}\n")
+
+def write_json(path, data):
+    _ensure_parent_dir(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+
+def write_csv(path, rows):
+    """Menulis List[Dict] ke CSV (header dari key baris pertama)."""
+    _ensure_parent_dir(path)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if not rows:
+            return
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
@@ -1,6 +1,9 @@
 import math
+import heapq
 from collections import Counter
 
+from src import instrumentation
+
 # --- Pre-computation ---
 
 def calculate_tf(docs):
@@ -94,6 +97,7 @@ def cosine_similarity(doc_vector, query_vector):
 
 def rank_documents(tfidf_matrix, query_vector, k):
     """Menghitung similarity dan meranking dokumen."""
+    instrumentation.count('documents_scored', len(tfidf_matrix))
     rankings = []
     for doc_id, doc_vector in tfidf_matrix.items():
         score = cosine_similarity(doc_vector, query_vector)
@@ -101,4 +105,64 @@ def rank_documents(tfidf_matrix, query_vector, k):
             rankings.append((doc_id, score))
             
     rankings.sort(key=lambda item: item[1], reverse=True)
-    return rankings[:k]
\ No newline at end of file
+    return rankings[:k]
+
+# --- Batch Scoring (Term-at-a-Time) ---
+
+def build_postings(tfidf_matrix):
+    """
+    Membalik TF-IDF Matriks menjadi postings berbobot.
+    :return: Dict[str, List[Tuple[str, float]]] -> {"gula": [("doc04.txt", 0.52), ...]}
+    """
+    postings = {}
+    for doc_id, doc_vector in tfidf_matrix.items():
+        for term, weight in doc_vector.items():
+            postings.setdefault(term, []).append((doc_id, weight))
+    return postings
+
+def calculate_doc_norms(tfidf_matrix):
+    """Pre-compute panjang (magnitude) setiap vektor dokumen."""
+    return {
+        doc_id: math.sqrt(sum(w**2 for w in doc_vector.values()))
+        for doc_id, doc_vector in tfidf_matrix.items()
+    }
+
+def rank_documents_batch(postings, doc_norms, query_vectors, k):
+    """
+    Meranking banyak query sekaligus dengan satu kali lintasan postings.
+    Postings setiap term hanya dibaca sekali walaupun term muncul di
+    beberapa query, lalu skor diakumulasi per query (term-at-a-time).
+    Hasil identik dengan rank_documents (cosine similarity).
+
+    :param postings: hasil build_postings
+    :param doc_norms: hasil calculate_doc_norms
+    :param query_vectors: List[Dict[str, float]] dari vectorize_query
+    :return: List[List[Tuple[str, float]]], satu ranking per query
+    """
+    # Kelompokkan bobot query per term: {term: [(query_idx, q_weight), ...]}
+    term_queries = {}
+    for query_idx, query_vector in enumerate(query_vectors):
+        for term, q_weight in query_vector.items():
+            term_queries.setdefault(term, []).append((query_idx, q_weight))
+
+    accumulators = [{} for _ in query_vectors]
+    for term, weighted_queries in term_queries.items():
+        term_postings = postings.get(term, ())
+        instrumentation.count('postings_scanned', len(term_postings))
+        for doc_id, d_weight in term_postings:
+            for query_idx, q_weight in weighted_queries:
+                acc = accumulators[query_idx]
+                acc[doc_id] = acc.get(doc_id, 0.0) + q_weight * d_weight
+
+    all_rankings = []
+    for query_vector, acc in zip(query_vectors, accumulators):
+        instrumentation.count('documents_scored', len(acc))
+        query_magnitude = math.sqrt(sum(w**2 for w in query_vector.values()))
+        rankings = []
+        if query_magnitude > 0:
+            for doc_id, dot_product in acc.items():
+                doc_magnitude = doc_norms.get(doc_id, 0)
+                if dot_product > 0 and doc_magnitude > 0:
+                    rankings.append((doc_id, dot_product / (doc_magnitude * query_magnitude)))
+        all_rankings.append(heapq.nlargest(k, rankings, key=lambda item: item[1]))
+    return all_rankings
@@ -0,0 +1,80 @@
+import sys
+import os
+import random
+import unittest
+import numpy as np
+
+# Menambahkan path agar bisa impor modul dari root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src import dedup
+
+"""
+Pengujian deteksi near-duplicate (src/dedup.py): MinHash, LSH, dan klaster.
+"""
+
+def random_doc(rng, vocabulary, length=80):
+    return [rng.choice(vocabulary) for _ in range(length)]
+
+class LshDuplicatePairsTest(unittest.TestCase):
+
+    def test_false_positive_first_member_does_not_hide_true_duplicates(self):
+        # 2 band x 2 baris. Ketiganya bertabrakan di band 0; hanya doc 1 & 2 yang mirip
+        # (Jaccard 3/4), dan keduanya tidak berbagi bucket di band 1.
+        signatures = np.array([
+            [1, 2, 7, 8], # tabrakan palsu, masuk bucket lebih dulu
+            [1, 2, 3, 4],
+            [1, 2, 3, 5],
+        ], dtype=np.uint64)
+        self.assertEqual(dedup.lsh_duplicate_pairs(signatures, 2, 2, 0.75), {(1, 2)})
+
+    def test_empty_signatures_are_not_paired(self):
+        signatures = np.full((3, 4), dedup.MAX_HASH, dtype=np.uint64)
+        self.assertEqual(dedup.lsh_duplicate_pairs(signatures, 2, 2, 0.5), set())
+
+class FindNearDuplicatesTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(7)
+        vocabulary = [f"kata{i}" for i in range(500)]
+        self.docs = {f"doc{i:02d}.txt": random_doc(rng, vocabulary) for i in range(20)}
+        original = self.docs["doc03.txt"]
+        # Salinan dengan satu token diubah di akhir (Jaccard shingle tetap tinggi)
+        self.docs["doc03_copy.txt"] = original[:-1] + ["berbeda"]
+
+    def test_planted_duplicate_is_clustered(self):
+        clusters = dedup.find_near_duplicates(self.docs, threshold=0.8)
+        self.assertEqual(clusters, {"doc03.txt": ["doc03_copy.txt"]})
+
+    def test_longest_document_is_representative(self):
+        self.docs["doc03_copy.txt"] = self.docs["doc03.txt"] + ["tambahan"]
+        clusters = dedup.find_near_duplicates(self.docs, threshold=0.8)
+        self.assertEqual(clusters, {"doc03_copy.txt": ["doc03.txt"]})
+
+    def test_empty_documents_are_not_merged(self):
+        self.docs["kosong1.txt"] = []
+        self.docs["kosong2.txt"] = []
+        clusters = dedup.find_near_duplicates(self.docs, threshold=0.8)
+        self.assertNotIn("kosong1.txt", clusters)
+        self.assertNotIn("kosong2.txt", clusters)
+        self.assertEqual(len(clusters), 1)
+
+    def test_collapse_keeps_only_representatives(self):
+        clusters = dedup.find_near_duplicates(self.docs, threshold=0.8)
+        collapsed = dedup.collapse_duplicates(self.docs, clusters)
+        self.assertNotIn("doc03_copy.txt", collapsed)
+        self.assertEqual(len(collapsed), len(self.docs) - 1)
+
+class ThresholdFromEnvTest(unittest.TestCase):
+
+    def test_values(self):
+        self.assertIsNone(dedup.threshold_from_env(''))
+        self.assertIsNone(dedup.threshold_from_env('0'))
+        self.assertEqual(dedup.threshold_from_env('1'), dedup.DEFAULT_THRESHOLD)
+        self.assertEqual(dedup.threshold_from_env('0.9'), 0.9)
+        self.assertEqual(dedup.threshold_from_env('abc'), dedup.DEFAULT_THRESHOLD)
+        self.assertEqual(dedup.threshold_from_env('1.5'), dedup.DEFAULT_THRESHOLD)
+
+
+if __name__ == '__main__':
+    unittest.main()
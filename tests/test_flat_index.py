@@ -0,0 +1,96 @@
+import sys
+import os
+import random
+import tempfile
+import unittest
+
+# Menambahkan path agar bisa impor modul dari root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src import boolean_ir, vsm_ir, flat_index, index_store
+from src.term_index import TermDictionary
+
+"""
+Pengujian flat index (src/flat_index.py & src/index_store.py): buffer biner
+dibandingkan dengan indeks dict in-memory yang menjadi sumbernya.
+"""
+
+SCHEMES = ('sublinear_tf', 'raw_tf')
+
+def build_dict_index(docs_tokens):
+    """Indeks in-memory (sama seperti search.build_models)."""
+    inverted_index = boolean_ir.build_inverted_index(docs_tokens)
+    idf = vsm_ir.calculate_idf(vsm_ir.calculate_df(docs_tokens), len(docs_tokens))
+    tf = vsm_ir.calculate_tf(docs_tokens)
+    tfidf_matrices = {scheme: vsm_ir.build_tfidf_matrix(tf, idf, scheme=scheme) for scheme in SCHEMES}
+    doc_norms = {scheme: vsm_ir.calculate_doc_norms(m) for scheme, m in tfidf_matrices.items()}
+    return inverted_index, idf, tfidf_matrices, doc_norms
+
+class FlatIndexRoundTripTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(3)
+        vocabulary = ["diabetes", "gula", "darah", "gizi", "kolesterol", "olahraga", "tidur",
+                      "demam", "berdarah", "nyamuk", "sabun", "tangan", "vitamin", "protein"]
+        cls.docs_tokens = {f"doc{i:02d}.txt": [rng.choice(vocabulary) for _ in range(rng.randint(5, 40))]
+                           for i in range(30)}
+        cls.docs_tokens["kosong.txt"] = [] # Dokumen tanpa token tetap harus tercatat
+        cls.inverted_index, cls.idf, cls.tfidf_matrices, cls.doc_norms = build_dict_index(cls.docs_tokens)
+        cls.index_bytes = flat_index.build_flat_index(
+            cls.inverted_index, cls.idf, cls.tfidf_matrices, cls.doc_norms,
+            metadata={"note": "uji"}, doc_ids=cls.docs_tokens.keys(),
+        )
+        cls.flat = flat_index.FlatIndex(cls.index_bytes)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.flat.release()
+
+    def test_metadata_and_doc_ids(self):
+        self.assertEqual(self.flat.metadata["note"], "uji")
+        self.assertEqual(self.flat.metadata["format"], flat_index.FORMAT_VERSION)
+        doc_ids = [self.flat.doc_id(i) for i in range(self.flat.n_docs)]
+        self.assertEqual(doc_ids, sorted(self.docs_tokens))
+        self.assertIn("kosong.txt", doc_ids)
+
+    def test_terms_idf_and_boolean_postings(self):
+        self.assertEqual(list(self.flat.terms), sorted(self.inverted_index))
+        for term, docs in self.inverted_index.items():
+            self.assertEqual(self.flat.boolean_view.get(term), docs)
+            self.assertAlmostEqual(self.flat.idf_view.get(term), self.idf[term])
+        self.assertEqual(self.flat.boolean_view.get("tidakada"), set())
+        self.assertEqual(self.flat.term_id("tidakada"), -1)
+
+    def test_rank_matches_dict_vsm(self):
+        for scheme in SCHEMES:
+            for query_tokens in (["diabetes"], ["gula", "darah"], ["demam", "nyamuk", "tidur"]):
+                query_vector = vsm_ir.vectorize_query(query_tokens, self.idf, scheme=scheme)
+                expected = vsm_ir.rank_documents(self.tfidf_matrices[scheme], query_vector, 5)
+                actual = [(self.flat.doc_id(doc_idx), score)
+                          for doc_idx, score in self.flat.rank(query_vector, 5, scheme)]
+                self.assertEqual([doc_id for doc_id, _ in actual], [doc_id for doc_id, _ in expected])
+                for (_, score), (_, expected_score) in zip(actual, expected):
+                    self.assertAlmostEqual(score, expected_score)
+
+    def test_kgram_view_matches_in_process_dictionary(self):
+        in_process = TermDictionary(self.inverted_index.keys())
+        shared = TermDictionary(self.flat.terms, k=self.flat.kgram_k, presorted=True,
+                                kgram_index=self.flat.kgram_view)
+        for pattern in ("*ah", "*o*a*", "d*h", "*tam*"):
+            self.assertEqual(shared.wildcard(pattern), in_process.wildcard(pattern), pattern)
+        for typo in ("diabetis", "kolestrol", "vitamn", "nyamk"):
+            self.assertEqual(shared.correct(typo), in_process.correct(typo), typo)
+
+    def test_mapped_index_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = index_store.publish_index(self.index_bytes, os.path.join(tmp_dir, 'index.bin'))
+            with index_store.attach_index(path) as mapped:
+                self.assertEqual(mapped.to_bytes(), self.index_bytes)
+                self.assertEqual(mapped.doc_ids(), sorted(self.docs_tokens))
+                expected = sorted(self.inverted_index["gizi"])
+                self.assertEqual(sorted(doc_id for doc_id, _, _ in mapped.search_boolean("gizi")), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import sys
+import os
+import time
+import unittest
+
+# Menambahkan path agar bisa impor modul dari root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.index_manager import IndexSnapshot, IndexManager
+
+"""
+Pengujian hot reload (src/index_manager.py): swap atomik, pin pembaca
+(refcount), dan penutupan snapshot lama. Loader & versi dipalsukan agar
+tidak perlu membangun indeks sungguhan.
+"""
+
+class FakeSharedIndex:
+    """Pengganti MappedIndex yang mencatat close()."""
+
+    def __init__(self, fail_on_close=False):
+        self.close_calls = 0
+        self.fail_on_close = fail_on_close
+
+    def close(self):
+        self.close_calls += 1
+        if self.fail_on_close:
+            raise OSError("mmap masih dipakai")
+
+class FakeCorpus:
+    """Loader & version_fn palsu: versi naik setiap kali bump() dipanggil."""
+
+    def __init__(self):
+        self.version = "v1"
+        self.built = []
+        self.fail_next = False
+        self.fail_on_close = False
+
+    def bump(self, version):
+        self.version = version
+
+    def version_fn(self):
+        return self.version
+
+    def loader(self):
+        if self.fail_next:
+            self.fail_next = False
+            raise RuntimeError("build gagal")
+        snapshot = IndexSnapshot({}, {}, None, {f"doc-{self.version}"},
+                                 shared_index=FakeSharedIndex(self.fail_on_close))
+        self.built.append(snapshot)
+        return snapshot
+
+class IndexManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = FakeCorpus()
+        self.swapped = []
+        self.manager = IndexManager(self.corpus.loader, self.corpus.version_fn, on_swap=self.swapped.append)
+        self.first = self.manager.load()
+
+    def tearDown(self):
+        self.manager.stop_watching(timeout=2)
+
+    def test_load_and_reload_only_on_new_version(self):
+        self.assertEqual(self.first.version, "v1")
+        self.assertFalse(self.manager.reload())
+        self.assertIs(self.manager.current(), self.first)
+
+        self.corpus.bump("v2")
+        self.assertTrue(self.manager.reload())
+        self.assertEqual(self.manager.current().version, "v2")
+        self.assertEqual(self.swapped, [self.first, self.manager.current()])
+        self.assertEqual(self.manager.reloads, 2)
+
+    def test_unpinned_old_snapshot_is_closed_on_swap(self):
+        self.corpus.bump("v2")
+        self.manager.reload()
+        self.assertTrue(self.first.retired)
+        self.assertTrue(self.first.closed)
+        self.assertEqual(self.first.shared_index.close_calls, 1)
+        self.assertFalse(self.manager.current().closed)
+
+    def test_pinned_snapshot_stays_open_until_last_reader(self):
+        with self.manager.acquire() as outer:
+            with self.manager.acquire() as inner:
+                self.corpus.bump("v2")
+                self.manager.reload()
+                self.assertIs(inner, self.first)
+                self.assertEqual(self.first.readers, 2)
+                self.assertTrue(self.first.retired)
+                self.assertFalse(self.first.closed) # Query yang berjalan tetap memakai snapshot lama
+            self.assertFalse(outer.closed)
+            with self.manager.acquire() as fresh:
+                self.assertEqual(fresh.version, "v2") # Query baru langsung memakai snapshot baru
+        self.assertTrue(self.first.closed)
+        self.assertEqual(self.first.readers, 0)
+        self.assertEqual(self.first.shared_index.close_calls, 1)
+
+    def test_failed_build_keeps_current_snapshot(self):
+        self.corpus.bump("v2")
+        self.corpus.fail_next = True
+        with self.assertRaises(RuntimeError):
+            self.manager.reload()
+        self.assertIs(self.manager.current(), self.first)
+        self.assertFalse(self.first.closed)
+        self.assertTrue(self.manager.reload()) # Build berikutnya berhasil
+
+    def test_close_error_is_recorded_not_raised(self):
+        self.corpus.fail_on_close = True
+        self.corpus.bump("v2")
+        self.manager.reload()
+        self.corpus.bump("v3")
+        self.assertTrue(self.manager.reload())
+        self.assertIn("mmap masih dipakai", self.manager.last_error)
+        self.assertEqual(self.manager.current().version, "v3")
+
+    def test_watcher_swaps_in_background(self):
+        self.manager.start_watching(poll_interval_s=0.01)
+        self.assertTrue(self.manager.status()["watching"])
+        self.corpus.bump("v2")
+        deadline = time.time() + 5
+        while self.manager.current().version != "v2" and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.manager.current().version, "v2")
+        self.manager.stop_watching(timeout=2)
+        self.assertFalse(self.manager.status()["watching"])
+        self.assertEqual(self.manager.status()["documents"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
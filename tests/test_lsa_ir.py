@@ -0,0 +1,61 @@
+import sys
+import os
+import unittest
+
+# Menambahkan path agar bisa impor modul dari root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src import lsa_ir, search
+from src.index_manager import IndexSnapshot
+
+"""
+Pengujian ranking LSA (src/lsa_ir.py) pada matriks TF-IDF sintetis kecil
+dengan dua topik yang tidak berbagi term sama sekali.
+"""
+
+TFIDF = {
+    "d1": {"cuci": 1.0, "tangan": 0.8, "sabun": 0.6},
+    "d2": {"tangan": 0.9, "sabun": 0.4},
+    "d3": {"cuci": 0.5, "sabun": 1.0},
+    "d4": {"gula": 1.0, "darah": 0.7, "diabetes": 0.9},
+    "d5": {"diabetes": 1.0, "insulin": 0.8},
+    "d6": {"gula": 0.6, "insulin": 1.0},
+}
+
+class LsaModelTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        matrix, doc_ids, terms = lsa_ir.matrix_from_tfidf(TFIDF)
+        cls.model = lsa_ir.build_lsa_model(matrix, doc_ids, terms, n_components=4)
+
+    def test_only_documents_from_query_topic_are_hits(self):
+        results = self.model.rank({"sabun": 1.0}, k=10)
+        self.assertTrue(results)
+        self.assertEqual({doc_id for doc_id, _ in results}, {"d1", "d2", "d3"})
+        self.assertTrue(all(score > lsa_ir.SCORE_EPSILON for _, score in results))
+
+    def test_query_without_overlapping_terms_returns_nothing(self):
+        self.assertEqual(self.model.rank({"xyzzy": 1.0}, k=10), [])
+        self.assertEqual(self.model.rank({}, k=10), [])
+
+    def test_blocked_ranking_matches_single_matvec(self):
+        query = {"gula": 1.0, "insulin": 0.5}
+        expected = self.model.rank(query, k=2)
+        self.assertEqual(len(expected), 2)
+        self.assertEqual(self.model.rank(query, k=2, block_size=2), expected)
+
+class LsaModelCacheTest(unittest.TestCase):
+
+    def test_models_are_cached_per_scheme_and_components(self):
+        snapshot = IndexSnapshot({}, {}, None, set(TFIDF), tfidf_matrices={'sublinear_tf': TFIDF})
+        small = search.get_lsa_model(snapshot=snapshot, n_components=2)
+        self.assertEqual(small.n_components, 2)
+        self.assertIs(search.get_lsa_model(snapshot=snapshot, n_components=2), small)
+        larger = search.get_lsa_model(snapshot=snapshot, n_components=3)
+        self.assertEqual(larger.n_components, 3)
+        self.assertEqual(set(snapshot.lsa_models), {('sublinear_tf', 2), ('sublinear_tf', 3)})
+
+
+if __name__ == '__main__':
+    unittest.main()
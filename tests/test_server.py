@@ -0,0 +1,127 @@
+import sys
+import os
+import json
+import asyncio
+import unittest
+
+# Menambahkan path agar bisa impor modul dari root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src import search
+from src.server import SearchServer, MAX_BODY_BYTES
+
+"""
+Pengujian layanan HTTP (src/server.py) di localhost.
+Server dijalankan di port acak (port 0) di atas indeks data/processed,
+lalu diakses lewat socket mentah agar header bisa diatur bebas.
+"""
+
+async def http_request(port, method, path, body=None, headers=None):
+    """
+    Kirim satu request HTTP/1.1 (Connection: close).
+    :return: Tuple (status, payload JSON)
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    data = json.dumps(body).encode('utf-8') if body is not None else b''
+    lines = [f"{method} {path} HTTP/1.1", "Host: localhost", "Connection: close"]
+    headers = dict(headers or {})
+    if data and 'Content-Length' not in headers:
+        headers['Content-Length'] = str(len(data))
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + data)
+    await writer.drain()
+
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    return status, json.loads(payload.decode('utf-8'))
+
+class SearchServerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        # max_wait_ms besar agar request bersamaan pasti tergabung dalam satu batch
+        self.server = await SearchServer('127.0.0.1', 0, max_batch_size=8, max_wait_ms=200.0).start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_health(self):
+        status, payload = await http_request(self.server.port, 'GET', '/health')
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["status"], "ok")
+        self.assertEqual(payload["documents"], len(search.MANAGER.current().all_doc_ids))
+
+    async def test_vsm_matches_search_module(self):
+        query = "gejala diabetes"
+        status, payload = await http_request(self.server.port, 'POST', '/search/vsm', {"query": query, "k": 3})
+        self.assertEqual(status, 200)
+        # Urutan istilah explain di search_vsm berasal dari irisan set, jadi dibandingkan sebagai himpunan
+        expected = [(doc_id, score, set(explain)) for doc_id, score, explain in search.search_vsm(query, 3)]
+        self.assertEqual([(doc_id, score, set(explain)) for doc_id, score, explain in payload["results"]], expected)
+
+    async def test_boolean_via_get(self):
+        status, payload = await http_request(self.server.port, 'GET', '/search/boolean?query=diabetes%20OR%20gizi')
+        self.assertEqual(status, 200)
+        expected = [doc_id for doc_id, _, _ in search.search_boolean("diabetes OR gizi")]
+        self.assertEqual([doc_id for doc_id, _, _ in payload["results"]], expected)
+
+    async def test_concurrent_requests_are_micro_batched(self):
+        queries = ["diabetes", "gizi seimbang", "cuci tangan", "demam berdarah", "olahraga", "kolesterol"]
+        responses = await asyncio.gather(*[
+            http_request(self.server.port, 'POST', '/search/vsm', {"query": query, "k": 5}) for query in queries
+        ])
+        for query, (status, payload) in zip(queries, responses):
+            self.assertEqual(status, 200)
+            self.assertEqual(payload["query"], query)
+            expected = [doc_id for doc_id, _, _ in search.search_vsm(query, 5)]
+            self.assertEqual([doc_id for doc_id, _, _ in payload["results"]], expected)
+
+        batcher = self.server.batchers['vsm']
+        self.assertEqual(batcher.items_processed, len(queries))
+        self.assertLess(batcher.batches_processed, len(queries))
+
+    async def test_duplicates_come_from_batch_snapshot(self):
+        snapshot = search.MANAGER.current()
+        top_doc = search.search_vsm("gejala diabetes", 1)[0][0]
+        original = snapshot.duplicates
+        snapshot.duplicates = {top_doc: ["salinan.txt"]}
+        try:
+            status, payload = await http_request(self.server.port, 'POST', '/search/vsm', {"query": "gejala diabetes", "k": 3})
+        finally:
+            snapshot.duplicates = original
+        self.assertEqual(status, 200)
+        self.assertEqual(payload["duplicates"], {top_doc: ["salinan.txt"]})
+
+    async def test_invalid_requests_return_400(self):
+        cases = [
+            ('POST', '/search/vsm', {"query": ""}, None),
+            ('POST', '/search/vsm', {"query": "diabetes", "k": 0}, None),
+            ('POST', '/search/vsm', {"query": "diabetes", "k": True}, None),
+            ('POST', '/search/vsm', {"query": "diabetes", "k": 2.7}, None),
+            ('GET', '/search/vsm?query=diabetes&k=dua', None, None),
+            ('POST', '/search/vsm', {"query": "diabetes", "scheme": "bm25"}, None),
+            ('POST', '/search/vsm', None, {"Content-Length": "-5"}),
+            ('POST', '/search/vsm', None, {"Content-Length": "abc"}),
+        ]
+        for method, path, body, headers in cases:
+            status, payload = await http_request(self.server.port, method, path, body, headers)
+            self.assertEqual(status, 400, (body, headers))
+            self.assertIn("error", payload)
+
+    async def test_oversized_body_returns_413(self):
+        headers = {"Content-Length": str(MAX_BODY_BYTES + 1)}
+        status, payload = await http_request(self.server.port, 'POST', '/search/vsm', None, headers)
+        self.assertEqual(status, 413)
+        self.assertIn("error", payload)
+
+    async def test_unknown_path_and_method(self):
+        status, _ = await http_request(self.server.port, 'GET', '/search/bm25')
+        self.assertEqual(status, 404)
+        status, _ = await http_request(self.server.port, 'DELETE', '/search/vsm')
+        self.assertEqual(status, 405)
+
+
+if __name__ == '__main__':
+    unittest.main()
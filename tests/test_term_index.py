@@ -0,0 +1,86 @@
+import sys
+import os
+import fnmatch
+import unittest
+
+# Menambahkan path agar bisa impor modul dari root
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src import term_index
+from src.term_index import TermDictionary
+
+"""
+Pengujian Term Dictionary (src/term_index.py): prefix, wildcard,
+edit distance, dan koreksi typo.
+"""
+
+TERMS = ["darah", "diabetes", "diare", "diet", "gizi", "gula", "kolesterol", "kulit", "protein", "sterol"]
+
+class EditDistanceTest(unittest.TestCase):
+
+    def test_distance(self):
+        self.assertEqual(term_index.edit_distance("kolestrol", "kolesterol"), 1)
+        self.assertEqual(term_index.edit_distance("gula", "gula"), 0)
+        self.assertEqual(term_index.edit_distance("", "diet"), 4)
+        self.assertEqual(term_index.edit_distance("diet", "diare"), 3)
+
+    def test_early_exit_returns_bound_plus_one(self):
+        self.assertEqual(term_index.edit_distance("gizi", "kolesterol", max_distance=2), 3)
+        self.assertEqual(term_index.edit_distance("diet", "diare", max_distance=1), 2)
+
+class TermDictionaryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.term_dict = TermDictionary(reversed(TERMS))
+
+    def test_terms_are_sorted_and_unique(self):
+        self.assertEqual(TermDictionary(TERMS + ["gula"]).terms, TERMS)
+        self.assertIn("gizi", self.term_dict)
+        self.assertNotIn("giz", self.term_dict)
+
+    def test_prefix(self):
+        self.assertEqual(self.term_dict.prefix("di"), ["diabetes", "diare", "diet"])
+        self.assertEqual(self.term_dict.prefix("di", limit=2), ["diabetes", "diare"])
+        self.assertEqual(self.term_dict.prefix("x"), [])
+
+    def test_wildcard_patterns(self):
+        self.assertEqual(self.term_dict.wildcard("diab*"), ["diabetes"])
+        self.assertEqual(self.term_dict.wildcard("*lesterol"), ["kolesterol"])
+        self.assertEqual(self.term_dict.wildcard("*sterol"), ["kolesterol", "sterol"]) # "*" = nol atau lebih huruf
+        self.assertEqual(self.term_dict.wildcard("*ster*"), ["kolesterol", "sterol"])
+        self.assertEqual(self.term_dict.wildcard("d*t"), ["diet"])
+        self.assertEqual(self.term_dict.wildcard("gizi"), ["gizi"])
+        self.assertEqual(self.term_dict.wildcard("zz*q"), [])
+
+    def test_wildcard_matches_brute_force(self):
+        for pattern in ["*i*", "*e", "g*a", "*ol", "k*l*t"]:
+            expected = [term for term in TERMS if fnmatch.fnmatchcase(term, pattern)]
+            self.assertEqual(self.term_dict.wildcard(pattern), expected, pattern)
+
+    def test_correct_typo(self):
+        self.assertEqual(self.term_dict.correct("kolestrol"), [("kolesterol", 1)])
+        self.assertEqual(self.term_dict.correct("diabetis")[0], ("diabetes", 1))
+        # Term pendek (<= 3 huruf) tidak dikoreksi
+        self.assertEqual(self.term_dict.correct("giz"), [])
+
+    def test_correct_orders_by_distance(self):
+        suggestions = self.term_dict.correct("diat", max_distance=2)
+        distances = [distance for _, distance in suggestions]
+        self.assertEqual(distances, sorted(distances))
+        self.assertEqual(suggestions[0], ("diet", 1))
+
+    def test_expand(self):
+        self.assertEqual(self.term_dict.expand("gula"), ["gula"])
+        self.assertEqual(self.term_dict.expand("kolestrol"), ["kolesterol"])
+        self.assertEqual(self.term_dict.expand("di*"), ["diabetes", "diare", "diet"])
+        self.assertEqual(self.term_dict.expand("xyzzyq"), [])
+
+    def test_presorted_dictionary_matches(self):
+        presorted = TermDictionary(TERMS, presorted=True)
+        self.assertIn("sterol", presorted)
+        self.assertEqual(presorted.wildcard("*ster*"), self.term_dict.wildcard("*ster*"))
+        self.assertEqual(presorted.correct("kolestrol"), self.term_dict.correct("kolestrol"))
+
+
+if __name__ == '__main__':
+    unittest.main()